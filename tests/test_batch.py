@@ -0,0 +1,40 @@
+"""
+    Unit tests of the batched solution of many geometries
+
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+from vlm.vlm import PyVLM
+from vlm.batch import vlm_batch
+
+
+def test_vlm_batch():
+    wings = [([np.array([0, 1.03]), np.array([.414, 8.14])],
+              [2.15, 1.24], 4, 3),
+             ([np.array([0, 0.5]), np.array([0.3, 2]), np.array([0.5, 3])],
+              [1.5, 1, 0.6], 2, 3),
+             ([np.array([0, 0]), np.array([1, 5])], [1, 1], 3, 4)]
+    alphas = [-2, 0, 5]
+
+    CL, CD = vlm_batch(wings, alphas)
+
+    assert CL.shape == (3, 3)
+
+    for k, definition in enumerate(wings):
+        wing = PyVLM()
+        wing.add_wing(*definition)
+        CL_, CD_ = wing.vlm_sweep(alphas)
+
+        assert_almost_equal(CL[k], CL_)
+        assert_almost_equal(CD[k], CD_)
+
+
+def test_vlm_batch_panel_count():
+    wings = [([np.array([0, 0]), np.array([1, 5])], [1, 1], 3, 4),
+             ([np.array([0, 0]), np.array([1, 5])], [1, 1], 3, 3)]
+
+    with pytest.raises(ValueError):
+        vlm_batch(wings, 0)
@@ -0,0 +1,102 @@
+"""
+    Unit tests of the AICCache class and its methods
+
+"""
+
+import os
+
+import pytest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+from vlm.vlm import PyVLM
+from vlm.cache import AICCache
+
+
+def wing(cache, m=2):
+    test_wing = PyVLM(cache)
+
+    A = np.array([0, 0])
+    B = np.array([0, 1])
+
+    leading_edges_position = [A, B]
+    chord_length = [1, 1]
+
+    n = 2
+    test_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+    return test_wing
+
+
+def test_cache_hit(tmp_path):
+    cache = AICCache(str(tmp_path))
+
+    test_wing = wing(cache)
+    expected_coeffs = test_wing.vlm(3)
+
+    assert len(os.listdir(str(tmp_path))) == 1
+
+    test_wing = wing(cache)
+    calculated_coeffs = test_wing.vlm(3)
+
+    assert isinstance(test_wing.AIC, np.memmap)
+    assert_almost_equal(calculated_coeffs, expected_coeffs)
+
+
+def test_cache_eviction(tmp_path):
+    # room for a single 8-panel entry (17 x 8 float64)
+    cache = AICCache(str(tmp_path), max_size=17*8*8 + 200)
+
+    wing(cache, m=2).vlm(3)
+    path = cache.path(wing(cache, m=2).Panels)
+    wing(cache, m=1).vlm(3)
+
+    assert not os.path.exists(path)
+    assert len(os.listdir(str(tmp_path))) == 1
+
+
+def test_cache_concurrent_eviction(tmp_path, monkeypatch):
+    cache = AICCache(str(tmp_path))
+    test_wing = wing(cache)
+    test_wing.vlm(3)
+    path = cache.path(test_wing.Panels)
+
+    # entry evicted by another process right after being listed
+    listdir = os.listdir
+    monkeypatch.setattr(os, 'listdir',
+                        lambda directory: listdir(directory) + ['gone.npy'])
+    cache.evict()
+
+    # entry evicted by another process while being loaded
+    utime = os.utime
+
+    def evicted(path):
+        os.remove(path)
+        utime(path)
+
+    monkeypatch.setattr(os, 'utime', evicted)
+    assert cache.load(test_wing.Panels) is not None
+    assert cache.load(test_wing.Panels) is None
+    assert not os.path.exists(path)
+
+
+def test_cache_stale_tmp(tmp_path):
+    cache = AICCache(str(tmp_path), max_tmp_age=60)
+
+    # temporary files left behind by crashed writers
+    stale = tmp_path / 'stale.tmp'
+    stale.write_bytes(bytes(100))
+    os.utime(str(stale), (0, 0))
+    recent = tmp_path / 'recent.tmp'
+    recent.write_bytes(bytes(100))
+
+    cache.evict()
+
+    assert not stale.exists()
+    assert recent.exists()
+
+    # temporary files count towards the size limit, but are never
+    # evicted while being written
+    cache.max_size = 17*8*8 + 200
+    wing(cache, m=2).vlm(3)
+    assert os.listdir(str(tmp_path)) == ['recent.tmp']
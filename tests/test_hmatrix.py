@@ -0,0 +1,74 @@
+"""
+    Unit tests of the H-matrix compression of the AIC
+
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+from vlm.vlm import PyVLM
+from vlm.vortices import v_induced_by_horseshoe_vortices
+from vlm.solvers import InfluenceOperator
+from vlm.hmatrix import Cluster, HMatrix, aca
+
+
+def test_cluster():
+    points = np.array([np.linspace(0, 1, 10), np.zeros(10)]).T
+    cluster = Cluster(points, np.arange(10)[::-1], 3)
+
+    left, right = cluster.children
+
+    assert sorted(left.indices) == [0, 1, 2, 3, 4]
+    assert sorted(right.indices) == [5, 6, 7, 8, 9]
+    assert not left.children[0].children
+
+
+def test_aca():
+    x, y = np.linspace(0, 1, 20), np.linspace(3, 4, 30)
+    M = 1 / (y[np.newaxis, :] - x[:, np.newaxis])
+
+    U, V, error, norm = aca(lambda i: M[i], lambda j: M[:, j], M.shape, 1e-8)
+
+    assert U.shape[1] < 10
+    assert_almost_equal(U @ V, M)
+
+
+def test_hmatrix():
+    y = np.linspace(-10, 10, 201)
+    A = np.array([np.zeros(200), y[:-1]]).T
+    B = np.array([np.zeros(200), y[1:]]).T
+    P = (A + B) / 2 + [0.5, 0]
+    x = np.sin(y[:-1])
+
+    AIC, _ = v_induced_by_horseshoe_vortices(P, A, B)
+    H = HMatrix(InfluenceOperator(P, A, B), leaf_size=16, tol=1e-10)
+
+    assert H.compression < 1
+    assert H.error < 1e-8
+    assert_almost_equal(H @ x, AIC @ x)
+    assert_almost_equal(H.block([3, 4], [5]), AIC[[3, 4]][:, [5]])
+
+
+def test_hmatrix_swept_wing():
+    leading_edges_position = [np.array([0, 0]), np.array([0.5, 6]),
+                              np.array([1, 8])]
+    chord_length = [2, 1, 0.5]
+
+    pyvlm = PyVLM()
+    pyvlm.add_wing(leading_edges_position, chord_length, 4, 20)
+    Panels = pyvlm.Panels
+
+    operator = InfluenceOperator(Panels.CP, Panels.A, Panels.B)
+    AIC, _ = operator.assemble()
+    H = HMatrix(operator, leaf_size=16, tol=1e-6)
+
+    H_dense = np.zeros(AIC.shape)
+    for r, c, U, V in H.blocks:
+        H_dense[np.ix_(r, c)] = U if V is None else U @ V
+    error = np.linalg.norm(H_dense - AIC) / np.linalg.norm(AIC)
+
+    assert H.compression < 1
+    assert error < 1e-6
+    # the reported error is a reliable estimate of the actual one
+    assert error / 10 < H.error < error * 10
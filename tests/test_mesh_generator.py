@@ -7,7 +7,7 @@ import pytest
 import numpy as np
 from numpy.testing import assert_almost_equal
 
-from vlm.mesh_generator import Mesh
+from vlm.mesh_generator import Mesh, spacing
 
 
 def test_mesh_points():
@@ -42,3 +42,61 @@ def test_mesh_panels():
                       np.array([0, .5]), np.array([1, 0.5])]
 
     assert_almost_equal(calculated_panel, expected_panel)
+
+
+def test_mesh_arrays():
+    A, B = np.array([0, 0]), np.array([0.5, 2])
+
+    leading_edges_coord = [A, B]
+    chord_lengths = [1, 0.5]
+
+    mesh = Mesh(leading_edges_coord, chord_lengths, 3, 2)
+
+    grid, panels, chordwise_position = mesh.arrays()
+
+    assert grid.shape == (4, 3, 2)
+    assert panels.shape == (6, 4)
+    assert_almost_equal(grid[:, 1], [[0.25, 1], [0.5, 1],
+                                     [0.75, 1], [1, 1]])
+    assert_almost_equal(grid.reshape(-1, 2)[panels[3]],
+                        [[0.75, 1], [0.5, 1], [0.66666667, 2], [0.83333333, 2]])
+    assert_almost_equal(chordwise_position, [1/6, 1/6, 0.5, 0.5,
+                                             5/6, 5/6])
+
+    mesh.points()
+    for panel, corners in zip(mesh.panels(), panels):
+        assert_almost_equal([panel.P1, panel.P2, panel.P3, panel.P4],
+                            grid.reshape(-1, 2)[corners])
+
+
+def test_spacing():
+    assert_almost_equal(spacing('uniform', 4), [0, 0.25, 0.5, 0.75, 1])
+    assert_almost_equal(spacing('cosine', 2), [0, 0.5, 1])
+    assert_almost_equal(spacing('half-cosine', 2), [0, 0.7071068, 1])
+    assert_almost_equal(spacing('geometric', 2, ratio=3), [0, 0.25, 1])
+    assert_almost_equal(spacing(('geometric', 3), 2), [0, 0.25, 1])
+    assert_almost_equal(spacing([0, 0.2, 1], 2), [0, 0.2, 1])
+
+    with pytest.raises(ValueError):
+        spacing('exponential', 2)
+    with pytest.raises(ValueError):
+        spacing([0, 0.6, 0.4, 1], 3)
+    with pytest.raises(ValueError):
+        spacing([0, 1], 3)
+
+
+def test_mesh_spacing():
+    A, B = np.array([0, 0]), np.array([1, 2])
+
+    leading_edges_coord = [A, B]
+    chord_lengths = [2, 1]
+
+    mesh = Mesh(leading_edges_coord, chord_lengths, 2, 2,
+                chordwise_spacing=[0, 0.25, 1],
+                spanwise_spacing='half-cosine')
+
+    grid, _, chordwise_position = mesh.arrays()
+
+    assert_almost_equal(grid[0], [[0, 0], [0.7071068, 1.4142136], [1, 2]])
+    assert_almost_equal(grid[:, 0, 0], [0, 0.5, 2])
+    assert_almost_equal(chordwise_position, [0.125, 0.125, 0.625, 0.625])
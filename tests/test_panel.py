@@ -7,7 +7,7 @@ import pytest
 import numpy as np
 from numpy.testing import assert_almost_equal
 
-from vlm.panel import Panel
+from vlm.panel import Panel, PanelTable
 
 
 def test_area():
@@ -74,3 +74,75 @@ def test_induced_velocity():
 
     assert_almost_equal(calculated_induced_velocity,
                         expected_induced_velocity)
+
+
+def test_panel_table():
+    P1, P2 = np.array([1, 0]), np.array([0, 0])
+    P3, P4 = np.array([0, 1]), np.array([1, 1])
+
+    panel = Panel(P1, P2, P3, P4)
+    panel_ = Panel(P1 + [1, 0], P2, P3, P4 + [0.5, 0])
+
+    table = PanelTable.from_panels([panel, panel_])
+
+    assert len(table) == 2
+    assert_almost_equal(table.area, [panel.area, panel_.area])
+    assert_almost_equal(table.span, [panel.span, panel_.span])
+    assert_almost_equal(table.CP, [panel.CP, panel_.CP])
+    assert_almost_equal(table.A, [panel.A, panel_.A])
+    assert_almost_equal(table.B, [panel.B, panel_.B])
+
+
+def test_panel_view():
+    P1, P2 = np.array([1, 0]), np.array([0, 0])
+    P3, P4 = np.array([0, 1]), np.array([1, 1])
+
+    table = PanelTable([P1, P1], [P2, P2], [P3, P3], [P4, P4])
+    table.extend([Panel(P1, P2, P3, P4)])
+    table[2].gamma = 2.0
+
+    assert_almost_equal(table.gamma, [0, 0, 2])
+    assert_almost_equal(table[-1].CP, [0.75, 0.5])
+    assert_almost_equal(table[1].induced_velocity(table[1].CP),
+                        [-0.7684680, -0.543389])
+
+
+def test_panel_table_topology():
+    P1, P2 = np.array([1, 0]), np.array([0, 0])
+    P3, P4 = np.array([0, 1]), np.array([1, 1])
+
+    # second panel downstream of the first one
+    table = PanelTable([P1, P1 + [1, 0]], [P2, P1], [P3, P4],
+                       [P4, P4 + [1, 0]])
+
+    # shared corners are stored once
+    assert len(table.topology.vertices) == 6
+    assert_almost_equal(table.P2[1], P1)
+    with pytest.raises(ValueError):
+        table.P1[0] = 0
+
+    # assigning a corner point moves the panel
+    table[1].P1 = P1 + [1.5, 0]
+
+    assert_almost_equal(table.P1, [P1, P1 + [1.5, 0]])
+    assert_almost_equal(table.P4, [P4, P4 + [1, 0]])
+    assert_almost_equal(table[1].CP, Panel(P1 + [1.5, 0], P1, P4,
+                                           P4 + [1, 0]).CP)
+
+
+def test_panel_table_slice():
+    P1, P2 = np.array([1, 0]), np.array([0, 0])
+    P3, P4 = np.array([0, 1]), np.array([1, 1])
+
+    table = PanelTable([P1, P1, P1], [P2, P2, P2], [P3, P3, P3],
+                       [P4, P4, P4])
+    table.gamma[:] = [1, 2, 3]
+
+    assert [panel.gamma for panel in table[1:]] == [2, 3]
+    assert [panel.gamma for panel in table[::-2]] == [3, 1]
+    assert table[np.int64(1)].gamma == 2
+
+    with pytest.raises(TypeError):
+        table[0.5]
+    with pytest.raises(IndexError):
+        table[3]
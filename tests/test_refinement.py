@@ -0,0 +1,130 @@
+"""
+    Unit tests of the adaptive mesh refinement
+
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+from vlm.vlm import PyVLM
+from vlm import refinement as refinement_module
+from vlm.refinement import refine_mesh, richardson, convergence_study
+
+
+leading_edges_position = [np.array([0, 0]), np.array([0.2, 1]),
+                          np.array([0.5, 3])]
+chord_length = [1, 0.8, 0.5]
+
+
+def solve(n, m, alpha):
+    pyvlm = PyVLM()
+    for k in range(len(m)):
+        pyvlm.add_wing(leading_edges_position[k:k + 2],
+                       chord_length[k:k + 2], n, m[k])
+
+    return pyvlm.vlm(alpha)
+
+
+def test_refine_mesh_per_segment(monkeypatch):
+    # meshes solved by the refinement
+    meshes = []
+
+    def _solve(*args):
+        meshes.append(args[3:5])
+        return solve_mesh(*args)
+
+    solve_mesh = refinement_module._solve
+    monkeypatch.setattr(refinement_module, '_solve', _solve)
+
+    tol = 5e-3
+    refinement = refine_mesh(leading_edges_position, chord_length, 4,
+                             tol=tol, per_segment=True, targets=('CL',),
+                             options={'symmetric': True})
+
+    n, m = refinement.n, refinement.m
+
+    assert refinement.converged
+    # no mesh is solved twice
+    assert len(set(meshes)) == len(meshes)
+    assert refinement.history[0]['N'] == 16
+    assert refinement.history[-1]['N'] == 2 * n * sum(m)
+    assert (np.diff([h['N'] for h in refinement.history]) > 0).all()
+
+    CL, CD = solve(n, m, 4)
+    assert_almost_equal((refinement.CL, refinement.CD), (CL, CD))
+    assert_almost_equal(refinement.pyvlm.vlm(4), (CL, CD))
+
+    # no refinement of the final mesh changes CL more than tol
+    for n_, m_ in [(2 * n, m), (n, [2 * m[0], m[1]]), (n, [m[0], 2 * m[1]])]:
+        assert abs(solve(n_, m_, 4)[0] - CL) < tol
+
+
+def test_refine_mesh_max_panels():
+    refinement = refine_mesh(leading_edges_position, chord_length, 4,
+                             tol=1e-6, max_panels=100)
+
+    assert not refinement.converged
+    assert [h['N'] for h in refinement.history] == [16, 64]
+    assert refinement.m == [4, 4]
+
+    with pytest.raises(ValueError):
+        refine_mesh(leading_edges_position, chord_length, 4,
+                    targets=('CM',))
+
+    # arrays of positions cannot be refined, unlike named spacing laws
+    with pytest.raises(ValueError):
+        refine_mesh(leading_edges_position, chord_length, 4,
+                    spanwise_spacing=[0, 0.2, 0.5, 0.7, 1])
+
+    refinement = refine_mesh(leading_edges_position, chord_length, 4,
+                             tol=1e-6, max_panels=100,
+                             spanwise_spacing=('geometric', 0.8))
+    assert refinement.m == [4, 4]
+
+
+def test_richardson():
+    h = np.array([1, 0.5, 0.25])
+
+    order, extrapolated = richardson(3 + 0.2 * h**2, 2)
+
+    assert_almost_equal(order, 2)
+    assert_almost_equal(extrapolated, 3)
+
+    assert np.isnan(richardson([1, 2, 1.5], 2)[0])
+
+
+def test_convergence_study():
+    leading_edges_position = [np.array([0, 0]), np.array([0.5, 3])]
+    chord_length = [1, 0.5]
+
+    studies = [convergence_study(leading_edges_position, chord_length, 4,
+                                 n=1, m=4, levels=4, n_workers=n_workers,
+                                 options={'symmetric': True})
+               for n_workers in [1, 2]]
+
+    study = studies[0]
+
+    assert_almost_equal(study.n, [1, 2, 4, 8])
+    assert_almost_equal(study.m, [4, 8, 16, 32])
+    assert_almost_equal(studies[1].CL, study.CL)
+
+    order, extrapolated = richardson(study.CL[1:], 2)
+    assert_almost_equal(study.order['CL'], order)
+    assert_almost_equal(study.extrapolated['CL'], extrapolated)
+    assert_almost_equal(study.error['CL'], abs(extrapolated - study.CL[-1]))
+
+    # the extrapolation is closer to a finer solve than the finest mesh
+    pyvlm = PyVLM(symmetric=True)
+    pyvlm.add_wing(leading_edges_position, chord_length, 16, 64)
+    CL, CD = pyvlm.vlm(4)
+
+    assert abs(extrapolated - CL) < abs(study.CL[-1] - CL)
+
+    with pytest.raises(ValueError):
+        convergence_study(leading_edges_position, chord_length, 4, levels=2)
+
+    # arrays of positions cannot be refined
+    with pytest.raises(ValueError):
+        convergence_study(leading_edges_position, chord_length, 4, m=2,
+                          spanwise_spacing=[0, 0.7, 1])
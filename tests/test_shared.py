@@ -0,0 +1,126 @@
+"""
+    Unit tests of the geometry shared between processes
+
+"""
+
+import sys
+import pickle
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+from vlm.vlm import PyVLM
+
+# multiprocessing.shared_memory is available since Python 3.8
+pytest.importorskip('multiprocessing.shared_memory')
+
+from vlm.shared import SharedVLM  # noqa: E402
+
+
+def solve(spec, alpha):
+    shared = SharedVLM.attach(spec)
+    pyvlm = shared.pyvlm()
+    CL, CD = pyvlm.vlm(alpha)
+
+    del pyvlm
+    shared.close()
+
+    return CL, CD
+
+
+@pytest.mark.parametrize('symmetric', [False, True])
+def test_shared_vlm(symmetric):
+    leading_edges_position = [np.array([0, 0]), np.array([0.5, 3])]
+    chord_length = [1, 0.5]
+
+    pyvlm = PyVLM(symmetric=symmetric)
+    pyvlm.add_wing(leading_edges_position, chord_length, 2, 3)
+    pyvlm.vlm(0)
+
+    shared = SharedVLM.export(pyvlm)
+    try:
+        # views of the segments, not copies
+        pyvlm_ = shared.pyvlm()
+        assert np.shares_memory(pyvlm_.AIC_inv, shared.arrays['AIC_inv'])
+        assert not pyvlm_.Panels.CP.flags.writeable
+        assert not pyvlm_.Topology.vertices.flags.writeable
+        with pytest.raises(ValueError):
+            pyvlm_.AIC[0, 0] = 1
+        del pyvlm_
+
+        alphas = [-2, 2, 4]
+        with ProcessPoolExecutor(2) as pool:
+            results = list(pool.map(solve, [shared.spec] * 3, alphas))
+
+        for alpha, result in zip(alphas, results):
+            assert_almost_equal(result, pyvlm.vlm(alpha))
+    finally:
+        shared.unlink()
+
+
+def test_shared_vlm_independent_processes(tmp_path):
+    leading_edges_position = [np.array([0, 0]), np.array([0.5, 3])]
+    chord_length = [1, 0.5]
+
+    pyvlm = PyVLM()
+    pyvlm.add_wing(leading_edges_position, chord_length, 2, 3)
+    CL, CD = pyvlm.vlm(2)
+
+    shared = SharedVLM.export(pyvlm)
+    try:
+        spec = tmp_path / 'spec.pkl'
+        spec.write_bytes(pickle.dumps(shared.spec))
+
+        script = ('import pickle; from vlm.shared import SharedVLM; '
+                  'shared = SharedVLM.attach(pickle.load(open(%r, "rb"))); '
+                  'pyvlm = shared.pyvlm(); print(*pyvlm.vlm(2)); '
+                  'del pyvlm; shared.close()' % str(spec))
+
+        # the segments outlive the processes attached to them
+        for k in range(2):
+            output = subprocess.run([sys.executable, '-c', script],
+                                    capture_output=True, text=True,
+                                    check=True)
+            assert_almost_equal([float(c) for c in output.stdout.split()],
+                                [CL, CD])
+            assert 'leaked' not in output.stderr
+    finally:
+        shared.unlink()
+
+
+def test_shared_vlm_not_solved():
+    pyvlm = PyVLM()
+    pyvlm.add_wing([np.array([0, 0]), np.array([0, 2])], [1, 1], 2, 2)
+
+    with pytest.raises(ValueError):
+        SharedVLM.export(pyvlm)
+
+
+@pytest.mark.parametrize('change', ['add_wing', 'move_panels'])
+def test_shared_vlm_after_incremental_change(change):
+    pyvlm = PyVLM()
+    pyvlm.add_wing([np.array([0, 0]), np.array([0.5, 3])], [1, 0.5], 4, 6)
+    pyvlm.vlm(3)
+
+    # changes of the mesh keeping the factorization of the AIC
+    if change == 'add_wing':
+        pyvlm.add_wing([np.array([4, 0]), np.array([4.2, 1])], [0.5, 0.3],
+                       2, 2)
+    else:
+        Panel = pyvlm.Panels
+        K = np.arange(len(Panel))[Panel.P1[:, 1] > 2.4]
+        shift = np.array([0.1, 0])
+        pyvlm.move_panels(K, Panel.P1[K] + shift, Panel.P2[K] + shift,
+                          Panel.P3[K] + shift, Panel.P4[K] + shift)
+    assert type(pyvlm.AIC_inv) != int
+
+    shared = SharedVLM.export(pyvlm)
+    try:
+        pyvlm_ = shared.pyvlm()
+        assert_almost_equal(pyvlm_.vlm(3), pyvlm.vlm(3))
+        del pyvlm_
+    finally:
+        shared.unlink()
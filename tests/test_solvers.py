@@ -0,0 +1,105 @@
+"""
+    Unit tests of the iterative solvers and matrix-free operators
+
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+from vlm.vortices import v_induced_by_horseshoe_vortices
+from vlm.solvers import (InfluenceOperator, OutOfCoreMatrix, BlockJacobi,
+                         gmres)
+
+
+def horseshoes():
+    y = np.linspace(-1, 1, 9)
+    A = np.array([0.25*np.ones(8), y[:-1]]).T
+    B = np.array([0.25*np.ones(8), y[1:]]).T
+    P = (A + B) / 2 + [0.5, 0]
+
+    return P, A, B
+
+
+def test_influence_operator():
+    P, A, B = horseshoes()
+    x = np.linspace(1, 2, 8)
+
+    AIC, W_trail = v_induced_by_horseshoe_vortices(P, A, B)
+    operator = InfluenceOperator(P, A, B, block_size=3)
+
+    assert_almost_equal(operator @ x, AIC @ x)
+    assert_almost_equal(operator.trailing_velocity(), W_trail.sum(axis=1))
+    assert_almost_equal(operator.block([1, 2], [2, 5]), AIC[[1, 2]][:, [2, 5]])
+
+
+def test_influence_operator_images():
+    P, A, B = horseshoes()
+    x = np.linspace(1, 2, 4)
+
+    AIC, _ = v_induced_by_horseshoe_vortices(P[4:], A, B)
+    operator = InfluenceOperator(P[4:], A, B, np.arange(4, 8),
+                                 np.arange(3, -1, -1))
+
+    assert_almost_equal(operator @ x, AIC @ np.concatenate((x[::-1], x)))
+
+
+def test_gmres():
+    P, A, B = horseshoes()
+    b = np.linspace(-1, 1, 8)
+
+    AIC, _ = v_induced_by_horseshoe_vortices(P, A, B)
+    M = BlockJacobi(AIC, [np.arange(0, 4), np.arange(4, 8)])
+
+    x, info = gmres(InfluenceOperator(P, A, B), b, M, tol=1e-10, restart=3)
+
+    assert_almost_equal(x, np.linalg.solve(AIC, b))
+    assert info['residual'] <= 1e-10
+    assert info['iterations'] > 0
+
+
+def test_gmres_not_converged():
+    P, A, B = horseshoes()
+    b = np.linspace(-1, 1, 8)
+
+    with pytest.warns(RuntimeWarning):
+        x, info = gmres(InfluenceOperator(P, A, B), b, tol=1e-10,
+                        restart=2, maxiter=2)
+
+    assert info['iterations'] == 2
+    assert info['residual'] > 1e-10
+
+
+def test_influence_operator_assemble():
+    P, A, B = horseshoes()
+
+    AIC, W_trail = v_induced_by_horseshoe_vortices(P, A, B)
+
+    for n_workers in [1, 3]:
+        operator = InfluenceOperator(P, A, B, block_size=3,
+                                     n_workers=n_workers)
+        calculated_AIC, calculated_Wi = operator.assemble()
+
+        assert_almost_equal(calculated_AIC, AIC)
+        assert_almost_equal(calculated_Wi, W_trail.sum(axis=1))
+
+
+def test_out_of_core_matrix(tmp_path):
+    P, A, B = horseshoes()
+    x = np.linspace(1, 2, 8)
+
+    AIC, W_trail = v_induced_by_horseshoe_vortices(P, A, B)
+
+    AIC_ = np.memmap(str(tmp_path / 'aic'), dtype=float, mode='w+',
+                     shape=(8, 8))
+    Wi = InfluenceOperator(P, A, B).assemble_tiled(AIC_, tile_size=3)
+
+    assert_almost_equal(AIC_, AIC)
+    assert_almost_equal(Wi, W_trail.sum(axis=1))
+
+    # room for 3 rows of the matrix at once
+    matrix = OutOfCoreMatrix(AIC_, memory_budget=3*8*8)
+
+    assert matrix.block_size == 3
+    assert_almost_equal(matrix @ x, AIC @ x)
+    assert_almost_equal(matrix.block([1, 2], [2, 5]), AIC[[1, 2]][:, [2, 5]])
@@ -0,0 +1,37 @@
+"""
+    Unit tests of the parameter sweep engine
+
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+from vlm.vlm import PyVLM
+from vlm.sweep import parameter_sweep
+
+
+def wing(span, taper, m=2):
+    leading_edges_position = [np.array([0, 0]), np.array([0.2, span / 2])]
+    chord_length = [1, taper]
+
+    return leading_edges_position, chord_length, 2, m
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_parameter_sweep(n_workers):
+    grid = {'span': [4, 6], 'taper': [1, 0.5], 'alpha': [0, 4]}
+
+    table = parameter_sweep(wing, grid, n_workers, panel_results=True,
+                            progress=False)
+
+    assert len(table['CL']) == 8
+    assert list(table['alpha']) == [0, 4] * 4
+
+    for row in range(8):
+        pyvlm = PyVLM()
+        pyvlm.add_wing(*wing(table['span'][row], table['taper'][row]))
+
+        assert_almost_equal((table['CL'][row], table['CD'][row]),
+                            pyvlm.vlm(table['alpha'][row]))
+        assert_almost_equal(table['cl'][row], pyvlm.Panels.cl)
@@ -0,0 +1,106 @@
+"""
+    Unit tests of the MeshTopology class and its methods
+
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_almost_equal
+
+from vlm.vlm import PyVLM
+from vlm.topology import MeshTopology
+
+
+def test_topology_add():
+    points = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+    panels = np.array([[2, 0, 1, 3]])
+
+    topology = MeshTopology()
+    topology.add(points, panels, 1)
+    index = topology.add(points * [1, -1], panels[:, ::-1], 1)
+
+    assert_almost_equal(index, [0, 4, 2, 5])
+    assert_almost_equal(topology.vertices, [[0, 0], [0, 1], [1, 0],
+                                            [1, 1], [0, -1], [1, -1]])
+    assert_almost_equal(topology.panels, [[2, 0, 1, 3], [5, 4, 0, 2]])
+    assert_almost_equal(topology.strip, [0, 1])
+    assert_almost_equal(topology.segment, [0, 1])
+    assert_almost_equal(topology.neighbours, [[1, -1, -1, -1],
+                                              [-1, -1, 0, -1]])
+
+
+def test_pyvlm_topology():
+    leading_edges_position = [np.array([0, 0]), np.array([0.2, 1]),
+                              np.array([0.5, 2])]
+    chord_length = [1, 0.8, 0.5]
+
+    n, m = 2, 3
+
+    pyvlm = PyVLM()
+    pyvlm.add_wing(leading_edges_position, chord_length, n, m)
+    pyvlm.check_mesh()
+
+    topology = pyvlm.Topology
+    Panels = pyvlm.Panels
+
+    # 4 segments of (n+1)(m+1) points, sharing 3 sides of n+1 points
+    assert len(pyvlm.Points) == 4 * (n + 1) * (m + 1) - 3 * (n + 1)
+
+    for corner, P in enumerate((Panels.P1, Panels.P2, Panels.P3, Panels.P4)):
+        assert_almost_equal(pyvlm.Points[topology.panels[:, corner]], P)
+
+    assert_almost_equal(topology.strip, Panels.strip)
+    assert topology.n_strips == 4 * m
+    assert_almost_equal(np.bincount(topology.segment), [n * m] * 4)
+
+    # Panels of a strip, and their neighbours across the strip sides
+    strip = topology.strip_panels(m)
+    assert_almost_equal(strip, [n * m, n * m + m])
+    assert_almost_equal(topology.neighbours[strip[0]],
+                        [m - 1, -1, n * m + 1, strip[1]])
+    assert_almost_equal(topology.strip_sum(Panels.area)[m],
+                        Panels.area[strip].sum())
+
+
+def test_check_mesh_coincident_points():
+    pyvlm = PyVLM()
+    pyvlm.add_wing([np.array([0, 0]), np.array([0, 1])], [1, 1], 1, 2)
+    pyvlm.Points = np.concatenate((pyvlm.Points, pyvlm.Points[:1]))
+
+    with pytest.raises(ValueError):
+        pyvlm.check_mesh()
+
+
+def test_move_panels_topology():
+    pyvlm = PyVLM()
+    pyvlm.add_wing([np.array([0, 0]), np.array([0, 1])], [1, 1], 2, 2)
+    Panels = pyvlm.Panels
+    topology = pyvlm.Topology
+
+    def check_consistency():
+        for corner, P in enumerate((Panels.P1, Panels.P2, Panels.P3,
+                                    Panels.P4)):
+            assert_almost_equal(pyvlm.Points[topology.panels[:, corner]], P)
+
+    # panel 0 is detached from its neighbours, which keep their corners
+    n_points = len(pyvlm.Points)
+    pyvlm.move_panels([0], Panels.P1[:1] + [0.1, 0], Panels.P2[:1],
+                      Panels.P3[:1], Panels.P4[:1] + [0.1, 0])
+
+    check_consistency()
+    assert len(pyvlm.Points) == n_points + 2
+    assert topology.neighbours[0, 3] == -1
+    pyvlm.check_mesh()
+
+    # panels moved together keep sharing their vertices
+    pyvlm.move_panels([0, 1], Panels.P1[:2], Panels.P2[:2] + [0, 0.1],
+                      Panels.P3[:2] + [0, 0.1], Panels.P4[:2])
+
+    check_consistency()
+    assert topology.panels[0, 2] == topology.panels[1, 1]
+
+    # conflicting positions of a shared vertex
+    with pytest.raises(ValueError):
+        pyvlm.move_panels([0, 1], Panels.P1[:2], Panels.P2[:2],
+                          Panels.P3[:2] + [[0, 0.1], [0, 0]], Panels.P4[:2])
+    check_consistency()
@@ -0,0 +1,80 @@
+"""
+    Unit tests of the tree-code evaluation of induced velocities
+
+"""
+
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from vlm.vlm import PyVLM
+from vlm.vortices import v_induced_by_horseshoe_vortices
+from vlm.treecode import HorseshoeTree, TreecodeOperator
+
+
+def horseshoes():
+    y = np.linspace(-10, 10, 401)
+    A = np.array([0.1*abs(y[:-1]), y[:-1]]).T
+    B = np.array([0.1*abs(y[1:]), y[1:]]).T
+    P = (A + B) / 2 + [0.5, 0]
+
+    return P, A, B
+
+
+def test_horseshoe_tree():
+    P, A, B = horseshoes()
+    gamma = 1 + np.cos(P[:, 1])
+
+    W, W_trail = v_induced_by_horseshoe_vortices(P, A, B)
+    tree = HorseshoeTree(A, B, theta=0.3, order=6, leaf_size=16)
+
+    assert_allclose(tree.induced_velocity(P, gamma), W @ gamma,
+                    rtol=1e-5, atol=1e-5)
+    assert_allclose(tree.induced_velocity(P, gamma, trailing=True),
+                    W_trail @ gamma, rtol=1e-5, atol=1e-5)
+
+
+def test_treecode_operator():
+    P, A, B = horseshoes()
+    x = np.ones((400, 2))
+
+    W, W_trail = v_induced_by_horseshoe_vortices(P, A, B)
+    operator = TreecodeOperator(P, A, B, theta=0.3)
+
+    assert_allclose(operator @ x, W @ x, rtol=1e-4, atol=1e-4)
+    assert_allclose(operator.trailing_velocity(), W_trail.sum(axis=1),
+                    rtol=1e-4, atol=1e-4)
+
+
+def test_horseshoe_tree_wake():
+    # points downstream of a two segment wing, inside the wake of the
+    # clusters of horseshoes (but beyond all of their bounded vortices)
+    pyvlm = PyVLM()
+    pyvlm.add_wing([np.array([0, 0]), np.array([0.5, 2]), np.array([1, 3])],
+                   [1, 0.8, 0.5], 2, 16)
+    A, B = pyvlm.Panels.A, pyvlm.Panels.B
+    gamma = 1 + np.cos(A[:, 1])
+
+    x, y = np.meshgrid(np.linspace(2, 20, 7), np.linspace(-3.3, 3.3, 23))
+    P = np.array([x.ravel(), y.ravel()]).T
+
+    W, W_trail = v_induced_by_horseshoe_vortices(P, A, B)
+    tree = HorseshoeTree(A, B, theta=0.3, order=6, leaf_size=8)
+
+    assert_allclose(tree.induced_velocity(P, gamma), W @ gamma,
+                    rtol=1e-4, atol=1e-4)
+    assert_allclose(tree.induced_velocity(P, gamma, trailing=True),
+                    W_trail @ gamma, rtol=1e-4, atol=1e-4)
+
+
+def test_treecode_single_row():
+    leading_edges_position = [np.array([0, 0]), np.array([0, 2])]
+    chord_length = [2, 2]
+
+    CL_CD = []
+    for solver in ['dense', 'treecode']:
+        pyvlm = PyVLM(solver=solver)
+        pyvlm.add_wing(leading_edges_position, chord_length, 1, 400)
+        CL_CD.append(pyvlm.vlm(4))
+
+    assert_allclose(CL_CD[1], CL_CD[0], rtol=1e-3)
@@ -3,11 +3,16 @@
 
 """
 
+import gc
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import numpy as np
 from numpy.testing import assert_almost_equal
 
 from vlm.vlm import PyVLM
+from vlm.mesh_generator import spacing
 
 
 def test_add_wing():
@@ -25,8 +30,8 @@ def test_add_wing():
     calculated_points = test_wing.Points
     expected_points = [np.array([0, 0]), np.array([0, .5]), np.array([0, 1]),
                        np.array([1, 0]), np.array([1, .5]), np.array([1, 1]),
-                       np.array([0, -1]), np.array([0, -.5]), np.array([0, 0]),
-                       np.array([1, -1]), np.array([1, -.5]), np.array([1, 0])]
+                       np.array([0, -1]), np.array([0, -.5]),
+                       np.array([1, -1]), np.array([1, -.5])]
 
     assert_almost_equal(calculated_points, expected_points)
 
@@ -52,3 +57,381 @@ def test_vlm():
                              [0.1634183, -0.768468]])
 
     assert_almost_equal(calculated_AIC, expected_AIC)
+
+
+def test_vlm_sweep():
+    test_vlm = PyVLM()
+
+    A = np.array([0, 0])
+    B = np.array([0, 1])
+
+    leading_edges_position = [A, B]
+    chord_length = [1, 1]
+
+    n, m = 2, 2
+    test_vlm.add_wing(leading_edges_position, chord_length, n, m)
+
+    alphas = [-2, 0, 5]
+    CL, CD, gamma, cl, cd = test_vlm.vlm_sweep(alphas, panel_gamma=True,
+                                               panel_forces=True)
+
+    for k, alpha in enumerate(alphas):
+        CL_, CD_ = test_vlm.vlm(alpha)
+
+        assert_almost_equal(CL[k], CL_)
+        assert_almost_equal(CD[k], CD_)
+        assert_almost_equal(gamma[:, k], test_vlm.Panels.gamma)
+        assert_almost_equal(cl[:, k], test_vlm.Panels.cl)
+        assert_almost_equal(cd[:, k], test_vlm.Panels.cd)
+
+
+def test_vlm_factorization_cache():
+    test_vlm = PyVLM()
+
+    A = np.array([0, 0])
+    B = np.array([0, 1])
+
+    leading_edges_position = [A, B]
+    chord_length = [1, 1]
+
+    n, m = 2, 2
+    test_vlm.add_wing(leading_edges_position, chord_length, n, m)
+
+    for alpha in [0, 3]:
+        test_vlm.vlm(alpha)
+
+        calculated_gamma = test_vlm.Panels.gamma
+        expected_gamma = np.linalg.solve(test_vlm.AIC, test_vlm.Panels.Vinf_n)
+
+        assert_almost_equal(calculated_gamma, expected_gamma)
+
+    test_vlm.add_wing([A + [3, 0], B + [3, 0]], chord_length, n, m)
+    N = len(test_vlm.Panels)
+
+    assert_almost_equal(test_vlm.AIC_inv @ test_vlm.AIC, np.eye(N))
+
+    test_vlm.reset()
+
+    assert type(test_vlm.AIC_inv) == int
+
+
+def test_vlm_symmetric():
+    A = np.array([0, 0.5])
+    B = np.array([0.3, 2])
+    C = np.array([0.5, 3])
+
+    leading_edges_position = [A, B, C]
+    chord_length = [1.5, 1, 0.6]
+
+    n, m = 3, 4
+
+    full_wing = PyVLM()
+    full_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+    half_wing = PyVLM(symmetric=True)
+    half_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+    for alpha in [0, 4]:
+        expected_coeffs = full_wing.vlm(alpha)
+        calculated_coeffs = half_wing.vlm(alpha)
+
+        assert_almost_equal(calculated_coeffs, expected_coeffs)
+        assert_almost_equal(half_wing.Panels.gamma, full_wing.Panels.gamma)
+
+    N = len(half_wing.Panels)
+
+    assert half_wing.AIC.shape == (N//2, N//2)
+    assert_almost_equal(half_wing.Panels.accul_trail_ind_vel,
+                        full_wing.Panels.accul_trail_ind_vel)
+
+
+def test_vlm_gmres():
+    A = np.array([0, 0.5])
+    B = np.array([0.3, 2])
+
+    leading_edges_position = [A, B]
+    chord_length = [1.5, 1]
+
+    n, m = 3, 4
+
+    dense_wing = PyVLM()
+    dense_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+    for symmetric in [False, True]:
+        gmres_wing = PyVLM(symmetric=symmetric, solver='gmres', tol=1e-12)
+        gmres_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+        assert_almost_equal(gmres_wing.vlm(4), dense_wing.vlm(4))
+        assert gmres_wing.solver_info[0]['residual'] <= 1e-12
+
+
+def test_vlm_hmatrix():
+    A = np.array([0, 0.5])
+    B = np.array([0.3, 5])
+
+    leading_edges_position = [A, B]
+    chord_length = [1.5, 1]
+
+    n, m = 2, 100
+
+    dense_wing = PyVLM()
+    dense_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+    for symmetric in [False, True]:
+        hmatrix_wing = PyVLM(symmetric=symmetric, solver='hmatrix',
+                             tol=1e-10, aca_tol=1e-10)
+        hmatrix_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+        assert_almost_equal(hmatrix_wing.vlm(4), dense_wing.vlm(4))
+        assert hmatrix_wing.AIC.compression < 1
+
+
+def test_vlm_treecode():
+    A = np.array([0, 0.5])
+    B = np.array([0.3, 5])
+
+    leading_edges_position = [A, B]
+    chord_length = [1.5, 1]
+
+    n, m = 2, 100
+
+    dense_wing = PyVLM()
+    dense_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+    for symmetric in [False, True]:
+        treecode_wing = PyVLM(symmetric=symmetric, solver='treecode',
+                              theta=0.2)
+        treecode_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+        assert_almost_equal(treecode_wing.vlm(4), dense_wing.vlm(4), 4)
+
+
+def test_vlm_out_of_core(tmp_path):
+    A = np.array([0, 0.5])
+    B = np.array([0.3, 2])
+
+    leading_edges_position = [A, B]
+    chord_length = [1.5, 1]
+
+    n, m = 3, 4
+
+    dense_wing = PyVLM()
+    dense_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+    ooc_wing = PyVLM(solver='out-of-core', tol=1e-12, tile_size=5,
+                     memory_budget=1000, aic_path=str(tmp_path / 'aic'))
+    ooc_wing.add_wing(leading_edges_position, chord_length, n, m)
+
+    assert_almost_equal(ooc_wing.vlm(4), dense_wing.vlm(4))
+    assert_almost_equal(ooc_wing.AIC.matrix, dense_wing.AIC)
+
+
+def test_vlm_out_of_core_temporary_file():
+    leading_edges_position = [np.array([0, 0.5]), np.array([0.3, 2])]
+    chord_length = [1.5, 1]
+
+    dense_wing = PyVLM()
+    dense_wing.add_wing(leading_edges_position, chord_length, 3, 4)
+
+    # the temporary file of the AIC is not left open
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ResourceWarning)
+
+        ooc_wing = PyVLM(solver='out-of-core', tol=1e-12)
+        ooc_wing.add_wing(leading_edges_position, chord_length, 3, 4)
+        assert_almost_equal(ooc_wing.vlm(4), dense_wing.vlm(4))
+
+        ooc_wing.reset()
+        gc.collect()
+
+    assert not [w for w in caught if w.category is ResourceWarning]
+
+
+def test_camber_slope():
+    test_vlm = PyVLM()
+
+    A = np.array([0, 0])
+    B = np.array([0, 1])
+
+    leading_edges_position = [A, B]
+    chord_length = [1, 1]
+
+    n, m = 2, 1
+    test_vlm.add_wing(leading_edges_position, chord_length, n, m)
+    test_vlm.vlm(2)
+
+    calculated_slope = test_vlm.camber_slope
+    expected_slope = [0.0375, -0.0388889, 0.0375, -0.0388889]
+
+    assert_almost_equal(calculated_slope, expected_slope)
+
+    test_vlm.add_wing(leading_edges_position, chord_length, n, m)
+
+    assert type(test_vlm.camber_slope) == int
+
+
+def test_add_wing_incremental():
+    wing_le = [np.array([0, 0.5]), np.array([0.3, 2])]
+    wing_chords = [1.5, 1]
+    tail_le = [np.array([4, 0]), np.array([4.2, 0.8])]
+    tail_chords = [0.8, 0.5]
+
+    expected_wing = PyVLM()
+    expected_wing.add_wing(wing_le, wing_chords, 3, 4)
+    expected_wing.add_wing(tail_le, tail_chords, 2, 2)
+    expected_coeffs = expected_wing.vlm(4)
+
+    calculated_wing = PyVLM()
+    calculated_wing.add_wing(wing_le, wing_chords, 3, 4)
+    calculated_wing.vlm(4)
+    calculated_wing.add_wing(tail_le, tail_chords, 2, 2)
+
+    assert_almost_equal(calculated_wing.AIC, expected_wing.AIC)
+    assert_almost_equal(calculated_wing.AIC_inv, expected_wing.AIC_inv)
+    assert_almost_equal(calculated_wing.vlm(4), expected_coeffs)
+    assert_almost_equal(calculated_wing.Panels.accul_trail_ind_vel,
+                        expected_wing.Panels.accul_trail_ind_vel)
+
+
+def test_move_panels():
+    leading_edges_position = [np.array([0, 0.5]), np.array([0.3, 2]),
+                              np.array([0.5, 3])]
+    chord_length = [1.5, 1, 0.6]
+
+    n, m = 3, 4
+
+    expected_wing = PyVLM()
+    expected_wing.add_wing(leading_edges_position[:2] + [np.array([0.7, 3])],
+                           chord_length, n, m)
+    expected_coeffs = expected_wing.vlm(4)
+
+    for max_rank in [100, 0]:
+        calculated_wing = PyVLM()
+        calculated_wing.add_wing(leading_edges_position, chord_length, n, m)
+        calculated_wing.vlm(4)
+
+        expected = expected_wing.Panels
+        calculated = calculated_wing.Panels
+        moved = np.flatnonzero((calculated.P1 != expected.P1).any(axis=1) |
+                               (calculated.P2 != expected.P2).any(axis=1) |
+                               (calculated.P3 != expected.P3).any(axis=1) |
+                               (calculated.P4 != expected.P4).any(axis=1))
+        calculated_wing.move_panels(moved, expected.P1[moved],
+                                    expected.P2[moved], expected.P3[moved],
+                                    expected.P4[moved], max_rank)
+
+        assert 0 < len(moved) < len(expected)
+        assert_almost_equal(calculated_wing.AIC, expected_wing.AIC)
+        assert_almost_equal(calculated_wing.vlm(4), expected_coeffs)
+        assert_almost_equal(calculated_wing.AIC_inv, expected_wing.AIC_inv)
+        assert_almost_equal(calculated_wing.Panels.accul_trail_ind_vel,
+                            expected.accul_trail_ind_vel)
+
+
+@pytest.mark.parametrize('options', [{}, {'symmetric': True},
+                                     {'solver': 'gmres', 'tol': 1e-12}])
+def test_solved_concurrent(options):
+    leading_edges_position = [np.array([0, 0]), np.array([0.5, 3])]
+    chord_length = [1, 0.5]
+
+    pyvlm = PyVLM(**options)
+    pyvlm.add_wing(leading_edges_position, chord_length, 3, 4)
+    solved = pyvlm.solved()
+
+    alphas = np.linspace(-4, 8, 16)
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(solved.solve, alphas))
+
+    # changes of the PyVLM object do not affect the solved geometry
+    pyvlm.reset()
+    pyvlm.add_wing(leading_edges_position, chord_length, 2, 2)
+
+    reference = PyVLM()
+    reference.add_wing(leading_edges_position, chord_length, 3, 4)
+    for alpha, result in zip(alphas, results):
+        assert_almost_equal((result.CL, result.CD), reference.vlm(alpha))
+        assert_almost_equal(result.gamma, reference.Panels.gamma)
+        assert_almost_equal(result.cd, reference.Panels.cd)
+
+    with pytest.raises(ValueError):
+        solved.span[0] = 0
+
+
+@pytest.mark.parametrize('solver', ['dense', 'gmres', 'treecode',
+                                    'hmatrix'])
+def test_solved_move_panels(solver):
+    leading_edges_position = [np.array([0, 0]), np.array([0.5, 3])]
+    chord_length = [1, 0.5]
+
+    pyvlm = PyVLM(solver=solver, tol=1e-12)
+    pyvlm.add_wing(leading_edges_position, chord_length, 3, 4)
+    solved = pyvlm.solved()
+
+    # the preconditioner is built without solving any system
+    assert pyvlm.solver_info == []
+
+    result = solved.solve(4)
+
+    # panels moved in place do not affect the solved geometry
+    Panels = pyvlm.Panels
+    moved = np.arange(4)
+    pyvlm.move_panels(moved, Panels.P1[moved] + [0.3, 0],
+                      Panels.P2[moved] + [0.3, 0], Panels.P3[moved] + [0.3, 0],
+                      Panels.P4[moved] + [0.3, 0])
+    pyvlm.vlm(4)
+
+    result_ = solved.solve(4)
+    assert_almost_equal((result_.CL, result_.CD), (result.CL, result.CD))
+    assert_almost_equal(result_.gamma, result.gamma)
+
+
+def test_add_wing_spacing():
+    leading_edges_position = [np.array([0, 0]), np.array([0.2, 1]),
+                              np.array([0.5, 3])]
+    chord_length = [1, 0.8, 0.5]
+
+    pyvlm = PyVLM(symmetric=True)
+    pyvlm.add_wing(leading_edges_position, chord_length, 3, 4,
+                   chordwise_spacing='cosine',
+                   spanwise_spacing='half-cosine')
+    pyvlm.vlm(2)
+
+    # the specular image is spaced like the right semi-span
+    assert pyvlm.symmetry is not None
+
+    # panels clustered towards the tip (across the kink), not towards the
+    # outer section of each segment
+    inner = pyvlm.Panels.span[:4]
+    outer = pyvlm.Panels.span[12:16]
+    assert (np.diff(inner) < 0).all() and (np.diff(outer) < 0).all()
+    assert_almost_equal(inner.sum(), 1)
+    assert_almost_equal(outer.sum(), 2)
+    assert outer[-1] / outer[0] < 0.5 * inner[-1] / inner[0]
+    S = spacing('half-cosine', 8)
+    assert_almost_equal(outer / outer.sum(), np.diff(S)[4:] / (1 - S[4]))
+
+    chordwise_position = pyvlm.Panels.chordwise_position[::4][:3]
+    assert_almost_equal(chordwise_position, [0.125, 0.5, 0.875])
+
+    # stretching ratio of the geometric law
+    pyvlm = PyVLM()
+    pyvlm.add_wing(leading_edges_position[:2], chord_length[:2], 1, 3,
+                   spanwise_spacing=('geometric', 2))
+    assert_almost_equal(pyvlm.Panels.span[:3], [1/7, 2/7, 4/7])
+
+
+def test_add_wing_panels_per_segment():
+    leading_edges_position = [np.array([0, 0]), np.array([0.2, 1]),
+                              np.array([0.5, 3])]
+    chord_length = [1, 0.8, 0.5]
+
+    pyvlm = PyVLM()
+    pyvlm.add_wing(leading_edges_position, chord_length, 2, [2, 4])
+
+    assert len(pyvlm.Panels) == 2 * 2 * (2 + 4)
+    assert pyvlm.Topology.n_strips == 2 * (2 + 4)
+    assert_almost_equal(pyvlm.Panels.span[:2], [0.5, 0.5])
+    assert_almost_equal(pyvlm.Panels.span[4:8], [0.5, 0.5, 0.5, 0.5])
+
+    with pytest.raises(ValueError):
+        pyvlm.add_wing(leading_edges_position, chord_length, 2, [2])
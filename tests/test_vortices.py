@@ -9,7 +9,9 @@ from numpy.testing import assert_almost_equal
 
 from vlm.vortices import (vortex_position_in_panel,
                             v_induced_by_horseshoe_vortex,
-                            v_induced_by_finite_vortex_line)
+                            v_induced_by_horseshoe_vortices,
+                            v_induced_by_finite_vortex_line,
+                            v_induced_by_finite_vortex_lines)
 
 
 def test_vortex_position_in_panel():
@@ -37,6 +39,40 @@ def test_v_induced_by_horseshoe_vortex():
     assert_almost_equal(calculated_vel, expected_vel)
 
 
+def test_v_induced_by_horseshoe_vortices():
+    P = np.array([[1, 0.5], [0, 0.5], [0.5, 0], [0.5, 1]])
+    A = np.array([[0, 0], [0.5, 0]])
+    B = np.array([[0, 1], [0.5, 1]])
+
+    calculated_vel = v_induced_by_horseshoe_vortices(P, A, B)
+
+    expected_vel = np.zeros((2, 4, 2))
+    for i in range(4):
+        for j in range(2):
+            expected_vel[:, i, j] = v_induced_by_horseshoe_vortex(P[i], A[j],
+                                                                  B[j])
+
+    assert_almost_equal(calculated_vel, expected_vel)
+
+
+def test_v_induced_by_horseshoe_vortices_aligned():
+    # points on the extension of a slanted bounded vortex, where round-off
+    # errors used to give a spurious velocity
+    A = np.array([[0.74333333, 3.2]])
+    B = np.array([[0.74916667, 3.4]])
+    P = A + np.array([[-23.5], [-10.3], [5.7]]) * (B - A)
+
+    v_total, v_trail = v_induced_by_horseshoe_vortices(P, A, B)
+
+    assert_almost_equal(v_total - v_trail, 0)
+
+    # same result with the scalar function
+    expected = np.array([v_induced_by_horseshoe_vortex(P_, A[0], B[0])
+                         for P_ in P])
+    assert_almost_equal(v_total[:, 0], expected[:, 0])
+    assert_almost_equal(v_trail[:, 0], expected[:, 1])
+
+
 def test_v_induced_by_finite_vortex_line():
     P = np.array([1, 0])
     A = np.array([0, 0])
@@ -46,3 +82,26 @@ def test_v_induced_by_finite_vortex_line():
     expected_vel = -0.056269769
 
     assert_almost_equal(calculated_vel, expected_vel)
+
+
+def test_v_induced_by_finite_vortex_lines():
+    P = np.array([[1, 0], [-0.5, 2], [0.3, 0.7]])
+    A = np.array([[0, 0], [1, 1]])
+    B = np.array([[0, 1], [2, 0.5]])
+    gamma = np.array([1, -2])
+
+    calculated_vel = v_induced_by_finite_vortex_lines(P, A, B, gamma)
+
+    expected_vel = np.zeros((3, 2))
+    for i in range(3):
+        for k in range(2):
+            expected_vel[i, k] = v_induced_by_finite_vortex_line(P[i], A[k],
+                                                                 B[k],
+                                                                 gamma[k])
+
+    assert_almost_equal(calculated_vel, expected_vel)
+
+    calculated_vel = v_induced_by_finite_vortex_lines(P, A, B, gamma,
+                                                      total=True)
+
+    assert_almost_equal(calculated_vel, expected_vel.sum(axis=1))
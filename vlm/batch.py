@@ -0,0 +1,76 @@
+import numpy as np
+
+from .vlm import PyVLM
+from .airfoils import NACA4
+from .vortices import v_induced_by_horseshoe_vortices
+
+
+def vlm_batch(wings, alphas, rho=1.225):
+    """
+    Applies the VLM theory to many geometries at once: their AIC
+    matrices are assembled as a single (n_wings, N, N) stack by the
+    batched horseshoe vortex kernel, and solved by one stacked call for
+    all the angles of attack. Useful for screening many coarse meshes,
+    where interpreter overhead would dominate the solution of each one
+    through its own PyVLM object.
+
+    Parameters
+    ----------
+    wings : list (containing tuples)
+            Definition of each wing, as the arguments of PyVLM.add_wing:
+            (lead_edge_coord, chord_lengths, n, m). All of them must
+            have the same number of panels
+    alphas : array_like
+             Angles of attack of the wings (degrees)
+    rho : float
+          Air density
+
+    Returns
+    -------
+    CL, CD : ndarray, shape (n_wings, n_alpha)
+             Lift and drag coefficients of each wing and angle of attack
+    """
+
+    alphas = np.deg2rad(np.atleast_1d(np.asarray(alphas, dtype=float)))
+    V = 1.0
+
+    q_inf = (1 / 2) * rho * (V**2)
+
+    panels = []
+    for definition in wings:
+        wing = PyVLM()
+        wing.add_wing(*definition)
+        panels.append(wing.Panels)
+
+    if len(set(len(Panel) for Panel in panels)) > 1:
+        msg = 'Same number of panels required for all the wings'
+        raise ValueError(msg)
+
+    CP = np.array([Panel.CP for Panel in panels])
+    A = np.array([Panel.A for Panel in panels])
+    B = np.array([Panel.B for Panel in panels])
+    span = np.array([Panel.span for Panel in panels])
+    area = np.array([Panel.area for Panel in panels])
+
+    # (n_wings, N, N) AIC matrices and trailing induced velocities
+    AIC, W_trail = v_induced_by_horseshoe_vortices(CP, A, B)
+    Wi = W_trail.sum(axis=2)
+
+    airfoil = NACA4()
+    camber_gradient = np.array([[airfoil.camber_gradient(position)
+                                 for position in Panel.chordwise_position]
+                                for Panel in panels])
+
+    # (n_wings, N, n_alpha) upstream normal velocities
+    Vinf_n = -V * (alphas - camber_gradient[:, :, np.newaxis])
+
+    gamma = np.linalg.solve(AIC, Vinf_n)
+
+    L = (V * rho * gamma * span[:, :, np.newaxis]).sum(axis=1)
+    D = (-rho * abs(gamma) * (span * Wi)[:, :, np.newaxis]).sum(axis=1)
+    S = area.sum(axis=1)[:, np.newaxis]
+
+    CL = L / (q_inf * S)
+    CD = D / (q_inf * S)
+
+    return CL, CD
@@ -0,0 +1,162 @@
+import os
+import time
+import hashlib
+import tempfile
+
+import numpy as np
+
+
+class AICCache(object):
+    """
+    Persistent on-disk cache of the geometry dependent part of the VLM:
+    the AIC matrix, its factorization and the induced velocity by the
+    trailing vortices on each panel.
+
+    Entries are keyed by a hash of the panels' corner points (and a tag
+    identifying the kind of system, e.g. the reduced one of a symmetric
+    solve) and stored as a single binary (.npy) file of shape (2n+1, n),
+    which holds the n x n AIC, its factorization and the trailing induced
+    velocities row after row, and is memory-mapped when loaded. Once the
+    cache grows beyond its size limit, the least recently used entries
+    are evicted.
+
+    The folder may be shared by several processes: entries are written
+    atomically, and those removed by another process in the meantime
+    are just missing ones.
+
+    Parameters
+    ----------
+    directory : string
+                Folder where the cache files are stored
+    max_size : integer
+               Maximum size of the cache (bytes), including the temporary
+               files being written
+    max_tmp_age : float
+                  Age (seconds) after which a temporary file is considered
+                  left behind by a crashed writer and removed
+    """
+
+    def __init__(self, directory, max_size=2**30, max_tmp_age=3600):
+        self.directory = directory
+        self.max_size = max_size
+        self.max_tmp_age = max_tmp_age
+
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def geometry_hash(panels):
+        """
+        Hash of the panels' geometry (corner points).
+        """
+
+        h = hashlib.sha1()
+        for P in (panels.P1, panels.P2, panels.P3, panels.P4):
+            h.update(np.ascontiguousarray(P, dtype=float).tobytes())
+
+        return h.hexdigest()
+
+    def path(self, panels, tag=''):
+        """
+        Location of the cache file of a given set of panels.
+        """
+
+        return os.path.join(self.directory,
+                            self.geometry_hash(panels) + tag + '.npy')
+
+    def load(self, panels, tag=''):
+        """
+        Returns the cached AIC, its factorization and the trailing
+        induced velocities (as read-only memory-mapped arrays) of a set of
+        panels, or None if they are not in the cache.
+        """
+
+        path = self.path(panels, tag)
+
+        # The entry may be evicted by another process at any time, but
+        # once mapped its data remain available
+        try:
+            data = np.load(path, mmap_mode='r')
+        except FileNotFoundError:
+            return None
+
+        N = data.shape[1]
+        if data.shape != (2*N + 1, N):
+            return None
+
+        try:
+            os.utime(path)  # marks the entry as recently used
+        except FileNotFoundError:
+            pass
+
+        return data[:N], data[N:2*N], data[2*N]
+
+    def save(self, panels, AIC, AIC_inv, trail_ind_vel, tag=''):
+        """
+        Stores the AIC, its factorization and the trailing induced
+        velocities of a set of panels, evicting the least recently used
+        entries if the size limit is exceeded.
+        """
+
+        N = len(AIC)
+
+        if (2*N + 1) * N * 8 > self.max_size:
+            return
+
+        data = np.empty((2*N + 1, N))
+        data[:N] = AIC
+        data[N:2*N] = AIC_inv
+        data[2*N] = trail_ind_vel
+
+        # Written to a temporary file first, so concurrent processes never
+        # load a partially written entry
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, data)
+            os.replace(tmp_path, self.path(panels, tag))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the temporary files left behind by crashed writers and
+        the least recently used entries until the cache fits within its
+        size limit. Files removed by another process in the meantime are
+        skipped.
+        """
+
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(('.npy', '.tmp')):
+                continue
+
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+                if (name.endswith('.tmp') and
+                        now - stat.st_mtime > self.max_tmp_age):
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        entries.sort()
+        size = sum(entry[1] for entry in entries)
+
+        for mtime, entry_size, name in entries:
+            if size <= self.max_size:
+                break
+            if name.endswith('.tmp'):
+                # still being written by another process
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            size -= entry_size
@@ -0,0 +1,294 @@
+import numpy as np
+
+
+class Cluster(object):
+    """
+    Node of a cluster tree: a set of rows or columns of a matrix whose
+    associated points are close to each other. Clusters are split in two
+    halves along the longest side of their bounding box, until they have
+    at most leaf_size elements.
+
+    Parameters
+    ----------
+    points : array_like, shape (n, 2)
+             Points associated to the rows or columns
+    indices : array_like
+              Rows or columns in the cluster
+    leaf_size : integer
+                Maximum number of elements of a leaf
+    """
+
+    def __init__(self, points, indices, leaf_size):
+        self.indices = indices
+        self.children = []
+
+        if len(indices) > leaf_size:
+            P = points[indices]
+            axis = np.argmax(P.max(axis=0) - P.min(axis=0))
+            order = np.argsort(P[:, axis], kind='stable')
+            half = len(indices) // 2
+
+            self.children = [Cluster(points, indices[order[:half]],
+                                     leaf_size),
+                             Cluster(points, indices[order[half:]],
+                                     leaf_size)]
+
+
+def _bounding_box(*points):
+    P = np.concatenate(points)
+
+    return P.min(axis=0), P.max(axis=0)
+
+
+def _diameter(box):
+    return np.linalg.norm(box[1] - box[0])
+
+
+def _distance(box_1, box_2):
+    gap = np.maximum(0, np.maximum(box_2[0] - box_1[1], box_1[0] - box_2[1]))
+
+    return np.linalg.norm(gap)
+
+
+def aca(get_row, get_col, shape, tol, max_rank=None, n_checks=3,
+        n_samples=8, seed=0):
+    """
+    Adaptive cross approximation (with partial pivoting) of a matrix
+    given through its rows and columns: returns U, V such that U·V
+    approximates it, with relative (Frobenius) error about tol.
+
+    A single small rank-one update does not mean the matrix has been
+    approximated (partial pivoting may miss whole directions of it), so
+    the iteration only stops after n_checks consecutive small updates,
+    and once the residual of the approximation on a random sample of
+    rows is small as well. Otherwise, it carries on from the sampled row
+    with the largest residual.
+
+    Parameters
+    ----------
+    get_row, get_col : callable
+                       Return the i-th row or j-th column of the matrix
+    shape : tuple
+            Shape of the matrix
+    tol : float
+          Relative tolerance of the approximation
+    max_rank : integer, optional
+               Maximum rank of the approximation
+    n_checks : integer
+               Consecutive small updates required to stop
+    n_samples : integer
+                Rows sampled to check the residual
+    seed : integer
+           Seed of the random sampling
+
+    Returns
+    -------
+    U : ndarray, shape (m, r)
+    V : ndarray, shape (r, n)
+    error, norm : float
+        Estimated error and norm (Frobenius) of the approximation. The
+        error is estimated from the residual of the sampled rows
+    """
+
+    m, n = shape
+    if max_rank is None:
+        max_rank = min(m, n)
+
+    rng = np.random.default_rng(seed)
+
+    U = np.zeros((m, 0))
+    V = np.zeros((0, n))
+    norm2 = 0
+    error = 0
+
+    free_rows = np.ones(m, dtype=bool)
+    i = 0
+    small = 0
+
+    while True:
+        if small >= n_checks or len(V) >= max_rank or not free_rows.any():
+            # Residual of the approximation on a sample of rows, whose
+            # mean (scaled to all the rows) estimates the error
+            sample = rng.choice(m, min(m, n_samples), replace=False)
+            residual = np.array([get_row(k) for k in sample]) - U[sample] @ V
+            residual2 = (residual**2).sum(axis=1)
+            error = np.sqrt(residual2.mean() * m)
+
+            if (error <= tol * np.sqrt(abs(norm2)) or
+                    len(V) >= max_rank or not free_rows.any()):
+                break
+
+            # restart from the worst approximated sampled row
+            small = 0
+            i = sample[np.argmax(residual2)]
+            free_rows[i] = True
+
+        free_rows[i] = False
+
+        row = get_row(i) - U[i] @ V
+        j = np.argmax(abs(row))
+
+        if row[j] == 0:
+            # row already approximated exactly: try another one
+            small += 1
+            if free_rows.any():
+                i = np.flatnonzero(free_rows)[0]
+            continue
+
+        v = row / row[j]
+        u = get_col(j) - U @ V[:, j]
+
+        # Estimate of the norm of the approximation
+        norm2 += (u @ u) * (v @ v) + 2 * (u @ U) @ (V @ v)
+
+        U = np.hstack((U, u[:, np.newaxis]))
+        V = np.vstack((V, v))
+
+        if np.linalg.norm(u) * np.linalg.norm(v) <= tol * np.sqrt(abs(norm2)):
+            small += 1
+        else:
+            small = 0
+
+        if free_rows.any():
+            i = np.flatnonzero(free_rows)[np.argmax(abs(u[free_rows]))]
+
+    return U, V, error, np.sqrt(abs(norm2))
+
+
+class HMatrix(object):
+    """
+    Hierarchical (H-matrix) compressed representation of the AIC matrix.
+    Rows (control points) and columns (horseshoe vortices) are arranged
+    in cluster trees, and the blocks between well-separated clusters,
+    whose interaction is numerically low rank, are stored as U·V
+    products computed by adaptive cross approximation. The rest of the
+    blocks are stored dense.
+
+    Since the trailing vortices extend downstream, a horseshoe cluster
+    spans from its bound vortices to the end of the mesh in the x
+    direction when checking its distance to a control point cluster.
+
+    Parameters
+    ----------
+    operator : InfluenceOperator
+               Matrix-free AIC, used to evaluate its entries
+    leaf_size : integer
+                Maximum number of rows or columns of a dense block
+    eta : float
+          Admissibility parameter: a block is compressed when the
+          smallest diameter of its clusters is below eta times their
+          distance
+    tol : float
+          Relative tolerance of the cross approximation of each block
+
+    Attributes
+    ----------
+    compression : float
+                  Stored entries relative to those of the dense matrix
+    error : float
+            Estimated relative (Frobenius norm) error of the matrix,
+            from the residual of the compressed blocks on random samples
+            of their rows (an estimate, not a bound)
+    """
+
+    def __init__(self, operator, leaf_size=32, eta=1.0, tol=1e-6):
+        self.operator = operator
+        self.shape = operator.shape
+        self.eta = eta
+        self.tol = tol
+
+        P, A, B = operator.P, operator.A, operator.B
+
+        columns = operator.columns
+        if columns is None:
+            columns = np.arange(len(A))
+        horseshoes = [columns]
+        if operator.images is not None:
+            horseshoes.append(operator.images)
+
+        x_far = max(P[:, 0].max(), A[:, 0].max(), B[:, 0].max())
+
+        # Points where the horseshoe vortices are located (their trailing
+        # vortices extended to the end of the mesh)
+        self._row_points = P
+        self._col_points = [(A[h], B[h], np.array([x_far*np.ones(len(h)),
+                                                   A[h, 1]]).T,
+                             np.array([x_far*np.ones(len(h)), B[h, 1]]).T)
+                            for h in horseshoes]
+
+        rows = Cluster(P, np.arange(self.shape[0]), leaf_size)
+        cols = Cluster((A[columns] + B[columns]) / 2,
+                       np.arange(self.shape[1]), leaf_size)
+
+        self.blocks = []
+        self._stored = 0
+        self._error2 = 0
+        self._norm2 = 0
+
+        self._build(rows, cols)
+
+        self.compression = self._stored / (self.shape[0] * self.shape[1])
+        self.error = np.sqrt(self._error2 / self._norm2)
+
+    def _admissible(self, rows, cols):
+        row_box = _bounding_box(self._row_points[rows.indices])
+        col_boxes = [_bounding_box(*[P[cols.indices] for P in points])
+                     for points in self._col_points]
+
+        diameter = min(_diameter(row_box),
+                       max(_diameter(box) for box in col_boxes))
+        distance = min(_distance(row_box, box) for box in col_boxes)
+
+        return diameter < self.eta * distance
+
+    def _build(self, rows, cols):
+        r, c = rows.indices, cols.indices
+        admissible = self._admissible(rows, cols)
+
+        if admissible:
+            def get_row(i):
+                return self.operator.block(r[i:i + 1], c)[0]
+
+            def get_col(j):
+                return self.operator.block(r, c[j:j + 1])[:, 0]
+
+            U, V, error, norm = aca(get_row, get_col, (len(r), len(c)),
+                                    self.tol)
+
+            # Only kept compressed if it actually saves memory
+            if U.size + V.size < len(r) * len(c):
+                self.blocks.append((r, c, U, V))
+                self._stored += U.size + V.size
+                self._error2 += error**2
+                self._norm2 += norm**2
+                return
+
+        if admissible or not (rows.children or cols.children):
+            D = self.operator.block(r, c)
+            self.blocks.append((r, c, D, None))
+            self._stored += D.size
+            self._norm2 += (D**2).sum()
+            return
+
+        for rows_ in (rows.children or [rows]):
+            for cols_ in (cols.children or [cols]):
+                self._build(rows_, cols_)
+
+    def __matmul__(self, x):
+        x = np.asarray(x, dtype=float)
+        y = np.zeros((self.shape[0],) + x.shape[1:])
+
+        for r, c, U, V in self.blocks:
+            if V is None:
+                y[r] += U @ x[c]
+            else:
+                y[r] += U @ (V @ x[c])
+
+        return y
+
+    def block(self, rows, cols):
+        """
+        Dense block [rows, cols] of the (uncompressed) matrix.
+        """
+
+        return self.operator.block(rows, cols)
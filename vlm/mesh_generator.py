@@ -3,6 +3,60 @@ import numpy as np
 from .panel import Panel
 
 
+def spacing(law, n, ratio=1.2):
+    """
+    Distribution of the n+1 points of a mesh line (chordwise or
+    spanwise), as positions from 0 to 1.
+
+    Parameters
+    ----------
+    law : string, tuple or array_like
+          'uniform', 'cosine' (points clustered at both ends),
+          'half-cosine' (clustered at the end of the line, e.g. the
+          wing tip), 'geometric' (each panel
+          "ratio" times longer than the previous one), a tuple
+          ('geometric', ratio), or the n+1 positions themselves
+    n : integer
+        Number of panels
+    ratio : float
+            Stretching ratio of the geometric spacing
+
+    Returns
+    -------
+    s : ndarray, shape (n+1,)
+    """
+
+    u = np.linspace(0, 1, n + 1)
+
+    if isinstance(law, tuple) and law and isinstance(law[0], str):
+        law, ratio = law
+
+    if isinstance(law, str):
+        if law == 'uniform':
+            return u
+        elif law == 'cosine':
+            return (1 - np.cos(np.pi * u)) / 2
+        elif law == 'half-cosine':
+            return np.sin(np.pi / 2 * u)
+        elif law == 'geometric':
+            width = ratio ** np.arange(n)
+            return np.concatenate(([0], np.cumsum(width) / width.sum()))
+
+        msg = "Spacing should be 'uniform', 'cosine', 'half-cosine', " \
+              "'geometric' or an array of positions"
+        raise ValueError(msg)
+
+    s = np.asarray(law, dtype=float)
+
+    if s.shape != (n + 1,) or s[0] != 0 or s[-1] != 1 or \
+            (np.diff(s) <= 0).any():
+        msg = 'Spacing should be an increasing array of n+1 positions ' \
+              'from 0 to 1'
+        raise ValueError(msg)
+
+    return s
+
+
 class Mesh(object):
     """
    Pi +......> y     Given a trapezoid defined by vertices Pi and Pf
@@ -34,6 +88,10 @@ chord1|   |
     n, m : integer
            n - nº of chordwise panels
            m - nº of spanwise panels
+    chordwise_spacing, spanwise_spacing : string, tuple or array_like
+                                          Distribution of the points from
+                                          the leading edge and from Pi
+                                          (see spacing), uniform by default
 
     Returns
     -------
@@ -43,77 +101,90 @@ chord1|   |
                   Mesh panels
     """
 
-    def __init__(self, leading_edges, chords, n, m):
+    def __init__(self, leading_edges, chords, n, m,
+                 chordwise_spacing='uniform', spanwise_spacing='uniform'):
         self.leading_edges = leading_edges
         self.chords = chords
         self.n = n
         self.m = m
+        self.chordwise_spacing = chordwise_spacing
+        self.spanwise_spacing = spanwise_spacing
         self.mesh_points = []
         self.mesh_panels = []
 
-    def points(self):
+    def arrays(self):
         """
-        Yields a list of length (n+1)*(m+1) containing equally spaced
-        points (x, y) coordinates (arrays), for each trapezoid geometry
-        defined by the arguments.
+        Array-native mesh, computed at once for the whole trapezoid.
+
+        Returns
+        -------
+        grid : ndarray, shape (n+1, m+1, 2)
+               Points (x, y) of the mesh, grid[i, j] being the i-th
+               chordwise and j-th spanwise one
+        panels : ndarray, shape (n*m, 4)
+                 Indices of the corner points P1, P2, P3, P4 of each
+                 panel in the flattened grid, grid.reshape(-1, 2)
+        chordwise_position : ndarray, shape (n*m,)
+                             Position of each panel w.r.t. the local chord
         """
 
-        Pi = self.leading_edges[0]
-        Pf = self.leading_edges[1]
-
-        chord_1 = np.array([self.chords[0], 0])
-        chord_2 = np.array([self.chords[1], 0])
+        Pi = np.asarray(self.leading_edges[0], dtype=float)
+        Pf = np.asarray(self.leading_edges[1], dtype=float)
 
         n = self.n
         m = self.m
 
-        for i in range(n + 1):
-            PiPf = Pf - Pi
-            P = Pi
-            for j in range(m + 1):
-                self.mesh_points.append(P)
-                P = P + PiPf / m
-            Pi = Pi + chord_1 / n
-            Pf = Pf + chord_2 / n
+        s = spacing(self.spanwise_spacing, m)
+        t = spacing(self.chordwise_spacing, n)
 
-        return self.mesh_points
+        # Leading edge and chord of each spanwise station
+        leading_edge = Pi + s[:, np.newaxis] * (Pf - Pi)
+        chord = self.chords[0] + s * (self.chords[1] - self.chords[0])
 
-    def panels(self):
-        """
-        Yields a list of length (n*m) containing the panels (objects),
-        defined by 4 points previously calculated. The points are properly
-        arranged to serve as locations for the horseshoe vortices.
-        """
+        grid = np.empty((n + 1, m + 1, 2))
+        grid[:, :, 0] = leading_edge[:, 0] + t[:, np.newaxis] * chord
+        grid[:, :, 1] = leading_edge[:, 1]
 
-        Pi = self.leading_edges[0]
-        chord_1 = np.array([self.chords[0], 0])
+        index = np.arange((n + 1) * (m + 1)).reshape(n + 1, m + 1)
+        panels = np.stack((index[1:, :-1], index[:-1, :-1],
+                           index[:-1, 1:], index[1:, 1:]), axis=-1)
 
-        n = self.n
-        m = self.m
+        # Chordwise position of each row of panels, given by the middle
+        # point of its side on the first spanwise station
+        panel_center = (grid[1:, 0] + grid[:-1, 0]) / 2
+        relative_pos = (np.linalg.norm(panel_center - Pi, axis=1) /
+                        self.chords[0])
 
-        N_panels = n * m
+        return grid, panels.reshape(-1, 4), np.repeat(relative_pos, m)
 
-        for i in range(N_panels):
-            # Panels list generation from mesh_points list
-            k = int(i / m)
+    def points(self):
+        """
+        Yields a list of length (n+1)*(m+1) containing the
+        points (x, y) coordinates (arrays), for each trapezoid geometry
+        defined by the arguments.
+        """
 
-            P1 = self.mesh_points[i + k + m + 1]
-            P2 = self.mesh_points[i + k]
-            P3 = self.mesh_points[i + k + 1]
-            P4 = self.mesh_points[i + k + m + 2]
+        grid, _, _ = self.arrays()
 
-            self.mesh_panels.append(Panel(P1, P2, P3, P4))
+        self.mesh_points.extend(grid.reshape(-1, 2))
 
-            # Chordwise position calculation
-            P1_ = self.mesh_panels[k * m].P1
-            P2_ = self.mesh_panels[k * m].P2
+        return self.mesh_points
+
+    def panels(self):
+        """
+        Yields a list of length (n*m) containing the panels (objects),
+        defined by 4 points previously calculated. The points are properly
+        arranged to serve as locations for the horseshoe vortices.
+        """
 
-            chord = P1_ - P2_
-            panel_center = P2_ + chord / 2
+        _, panels, chordwise_position = self.arrays()
 
-            leadEdge_2_panel = np.linalg.norm(panel_center - Pi)
-            relative_pos = leadEdge_2_panel / np.linalg.norm(chord_1)
+        points = self.mesh_points
+        for (i1, i2, i3, i4), relative_pos in zip(panels,
+                                                  chordwise_position):
+            panel = Panel(points[i1], points[i2], points[i3], points[i4])
+            panel.chordwise_position = relative_pos
 
-            self.mesh_panels[i].chordwise_position = relative_pos
+            self.mesh_panels.append(panel)
 
         return self.mesh_panels
@@ -1,4 +1,9 @@
+import operator
+
+import numpy as np
+
 from .geometry import area_4points
+from .topology import MeshTopology
 from .vortices import (vortex_position_in_panel,
                        v_induced_by_horseshoe_vortex)
 
@@ -52,3 +57,282 @@ class Panel(object):
         v = v_induced_by_horseshoe_vortex(control_point_pos, self.A, self.B)
 
         return v[0], v[1]
+
+
+class PanelTable(object):
+    """
+    Struct-of-arrays store of a set of panels. Horseshoe vortex positions
+    and control points are kept as contiguous (N, 2) arrays, while panel
+    properties and VLM results are kept as (N,) arrays, so every stage
+    of the method can work on all the panels at once.
+
+    Corner points are not stored per panel: they are read from the
+    vertices of the mesh topology, shared by the panels touching them,
+    which also holds the spanwise strip of each panel.
+
+    Indexing the table returns a PanelView, a lightweight object with
+    the same attributes as Panel that reads and writes the i-th row.
+
+    Parameters
+    ----------
+    P1, P2, P3, P4 : array_like, shape (N, 2)
+                     Corner points of each panel, ordered clockwise
+    chordwise_position : array_like, shape (N,)
+                         Position of each panel w.r.t. the local chord
+    strip : array_like, shape (N,)
+            Spanwise strip each panel belongs to (by default, every panel
+            is a strip of its own)
+    topology : MeshTopology, optional
+               Topology the panels are added to (a new one by default)
+    """
+
+    corners = ('P1', 'P2', 'P3', 'P4')
+    results = ('accul_trail_ind_vel', 'alpha_ind', 'Vinf_n', 'gamma',
+               'l', 'd', 'cl', 'cd')
+
+    def __init__(self, P1=(), P2=(), P3=(), P4=(),
+                 chordwise_position=None, strip=None, topology=None):
+        self.topology = MeshTopology() if topology is None else topology
+
+        self.CP = np.empty((0, 2))
+        self.A = np.empty((0, 2))
+        self.B = np.empty((0, 2))
+        self.area = np.empty(0)
+        self.span = np.empty(0)
+        self.chordwise_position = np.empty(0)
+        for name in self.results:
+            setattr(self, name, np.empty(0))
+
+        points = np.concatenate([np.asarray(P, dtype=float).reshape(-1, 2)
+                                 for P in (P1, P2, P3, P4)])
+        N = len(points) // 4
+        if N > 0:
+            # every panel is a strip of its own unless told otherwise
+            self.add(points, np.arange(4*N).reshape(4, N).T, N,
+                     chordwise_position, strip)
+
+    def add(self, points, panels, m, chordwise_position=None, strip=None):
+        """
+        Appends the panels of a wing segment, merging their corner points
+        with the vertices of the topology (see MeshTopology.add).
+
+        Parameters
+        ----------
+        points : array_like, shape (Np, 2)
+                 Points of the segment
+        panels : array_like, shape (NP, 4)
+                 Indices of the corner points of each panel in "points"
+        m : integer
+            Number of spanwise strips of the segment
+        chordwise_position : array_like, shape (NP,)
+                             Position of each panel w.r.t. the local chord
+        strip : array_like, shape (NP,), optional
+                Strip of each panel within the segment
+        """
+
+        N0 = len(self)
+        self.topology.add(points, panels, m, strip)
+
+        P1, P2, P3, P4 = self._corner_points(slice(N0, None))
+        CP, A, B = vortex_position_in_panel(P1, P2, P3, P4)
+        N = len(CP)
+
+        position = np.zeros(N)
+        if chordwise_position is not None:
+            position[:] = chordwise_position
+
+        self.CP = np.concatenate((self.CP, CP))
+        self.A = np.concatenate((self.A, A))
+        self.B = np.concatenate((self.B, B))
+        self.area = np.concatenate((self.area,
+                                    area_4points(P1.T, P2.T, P3.T, P4.T)))
+        self.span = np.concatenate((self.span, abs(P3[:, 1] - P2[:, 1])))
+        self.chordwise_position = np.concatenate((self.chordwise_position,
+                                                  position))
+        for name in self.results:
+            setattr(self, name, np.concatenate((getattr(self, name),
+                                                np.zeros(N))))
+
+    def _corner_points(self, index):
+        # Corner points P1, P2, P3 and P4 of the given panels
+        vertices = self.topology.vertices
+        corners = self.topology.panels[index]
+
+        return [vertices[corners[..., k]] for k in range(4)]
+
+    def _corner(k):
+        def corner(self):
+            # Copy of the corner points, read-only so that writing to it
+            # is not mistaken for moving the panels (see update)
+            P = self._corner_points(slice(None))[k]
+            P.flags.writeable = False
+            return P
+
+        return property(corner, doc='Corner points P%d of the panels' %
+                        (k + 1))
+
+    P1 = _corner(0)
+    P2 = _corner(1)
+    P3 = _corner(2)
+    P4 = _corner(3)
+    del _corner
+
+    @property
+    def strip(self):
+        """
+        Spanwise strip each panel belongs to.
+        """
+
+        return self.topology.strip
+
+    @classmethod
+    def from_panels(cls, panels):
+        """
+        Builds the table from a list of Panel objects.
+        """
+
+        return cls([panel.P1 for panel in panels],
+                   [panel.P2 for panel in panels],
+                   [panel.P3 for panel in panels],
+                   [panel.P4 for panel in panels],
+                   [panel.chordwise_position for panel in panels])
+
+    def extend(self, panels):
+        """
+        Appends the panels of another PanelTable (or of a list of Panel
+        objects) at the end of the table, whose strips are numbered
+        after the existing ones.
+        """
+
+        if not isinstance(panels, PanelTable):
+            panels = PanelTable.from_panels(panels)
+
+        N0 = len(self)
+        topology = panels.topology
+        self.add(topology.vertices, topology.panels, topology.n_strips,
+                 panels.chordwise_position, topology.strip)
+
+        for name in self.results:
+            getattr(self, name)[N0:] = getattr(panels, name)
+
+    def update(self, indices, P1, P2, P3, P4):
+        """
+        Moves the corner points of some panels (see MeshTopology.move),
+        updating the position of their horseshoe vortices, area and span.
+        Their chordwise position, relative to the local chord, is kept.
+        """
+
+        self.topology.move(indices, P1, P2, P3, P4)
+
+        P1, P2, P3, P4 = self._corner_points(indices)
+
+        (self.CP[indices], self.A[indices],
+         self.B[indices]) = vortex_position_in_panel(P1, P2, P3, P4)
+        self.area[indices] = area_4points(P1.T, P2.T, P3.T, P4.T)
+        self.span[indices] = abs(P3[:, 1] - P2[:, 1])
+
+    def mirror_index(self):
+        """
+        Index of the specular image (w.r.t. the OX axis) of each panel, or
+        None if the set of panels is not symmetric.
+        """
+
+        N = len(self)
+        if N == 0:
+            return None
+
+        # Control points are compared rounded, relative to the size of the
+        # mesh, so round-off errors do not spoil the matching
+        scale = abs(self.CP).max() or 1
+        CP = np.round(self.CP / scale, 9)
+        CP_ = np.round(self.CP * [1, -1] / scale, 9)
+
+        order = np.lexsort((CP[:, 1], CP[:, 0]))
+        order_ = np.lexsort((CP_[:, 1], CP_[:, 0]))
+
+        mirror = np.empty(N, dtype=int)
+        mirror[order_] = order
+
+        if not (CP[mirror] == CP_).all() or (mirror == np.arange(N)).any():
+            return None
+
+        return mirror
+
+    def __len__(self):
+        return len(self.CP)
+
+    def __getitem__(self, index):
+        # Slices give a list of views, as the former list of panels did
+        if isinstance(index, slice):
+            return [PanelView(self, i)
+                    for i in range(*index.indices(len(self)))]
+
+        try:
+            index = operator.index(index)
+        except TypeError:
+            msg = 'Panel indices must be integers or slices, not %s' % \
+                  type(index).__name__
+            raise TypeError(msg)
+
+        if not -len(self) <= index < len(self):
+            raise IndexError('Panel index out of range')
+
+        return PanelView(self, index % len(self))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield PanelView(self, i)
+
+
+class PanelView(object):
+    """
+    Panel-like access to the i-th row of a PanelTable. Attributes are
+    not copied: reading and assigning them acts on the table arrays.
+
+    Parameters
+    ----------
+    table : PanelTable
+            Table containing the panel
+    index : integer
+            Row of the panel in the table
+    """
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        object.__setattr__(self, '_table', table)
+        object.__setattr__(self, '_index', index)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        table = self._table
+        if name in table.corners:
+            k = table.corners.index(name)
+            return table.topology.vertices[table.topology.panels[self._index,
+                                                                 k]]
+
+        return getattr(table, name)[self._index]
+
+    def __setattr__(self, name, value):
+        table = self._table
+        if name in table.corners:
+            # the panel is moved (see PanelTable.update)
+            P = [[getattr(self, corner)] for corner in table.corners]
+            P[table.corners.index(name)] = [value]
+            table.update([self._index], *P)
+            return
+
+        getattr(table, name)[self._index] = value
+
+    def induced_velocity(self, control_point_pos):
+        """
+        Returns the induced velocity by a horseshoe vortex and the induced
+        velocity excluding the bounded segment at a control point, defined
+        as argument of the method, that does not have to be its own CP.
+        """
+
+        v = v_induced_by_horseshoe_vortex(control_point_pos, self.A, self.B)
+
+        return v[0], v[1]
@@ -0,0 +1,337 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .vlm import PyVLM
+
+
+class MeshRefinement(object):
+    """
+    Result of the adaptive refinement of a wing mesh.
+
+    Parameters
+    ----------
+    pyvlm : PyVLM
+            Lifting surface with the final mesh, solved for the angle of
+            attack of the refinement
+    n : integer
+        Final nº of chordwise panels
+    m : list
+        Final nº of spanwise panels of each segment
+    CL, CD : float
+             Lift and drag coefficients with the final mesh
+    history : list
+              Accepted meshes, as dictionaries with their "n", "m",
+              number of panels "N", "CL", "CD" and the largest change of
+              the target coefficients w.r.t. the previous mesh ("change")
+    converged : boolean
+                Whether refining the final mesh changes the coefficients
+                less than the tolerance (False if the maximum number of
+                panels was reached first)
+    """
+
+    def __init__(self, pyvlm, n, m, CL, CD, history, converged):
+        self.pyvlm = pyvlm
+        self.n = n
+        self.m = m
+        self.CL = CL
+        self.CD = CD
+        self.history = history
+        self.converged = converged
+
+
+class ConvergenceStudy(object):
+    """
+    Result of a convergence study of the coefficients of a wing over a
+    geometric sequence of meshes.
+
+    Parameters
+    ----------
+    n, m : ndarray, shape (levels,)
+           Nº of chordwise and spanwise (per segment) panels of each mesh
+    CL, CD : ndarray, shape (levels,)
+             Lift and drag coefficients with each mesh
+    order : dict
+            Observed order of convergence of "CL" and "CD"
+    extrapolated : dict
+                   Richardson extrapolation of "CL" and "CD"
+    error : dict
+            Estimated error of the coefficients of the finest mesh,
+            i.e. its difference with the extrapolated ones (Richardson
+            error estimate)
+    """
+
+    def __init__(self, n, m, CL, CD, order, extrapolated, error):
+        self.n = n
+        self.m = m
+        self.CL = CL
+        self.CD = CD
+        self.order = order
+        self.extrapolated = extrapolated
+        self.error = error
+
+
+def _check_mesh_options(mesh_options):
+    # Arrays of positions fix the nº of panels, so they cannot be refined
+    for name, law in mesh_options.items():
+        if not (isinstance(law, str) or (isinstance(law, tuple) and law and
+                                         isinstance(law[0], str))):
+            msg = "Only named spacing laws (e.g. 'cosine' or ('geometric'" \
+                  ", 1.5)) can be refined, not the positions given as " \
+                  "%s" % name
+            raise ValueError(msg)
+
+
+def _solve(lead_edge_coord, chord_lengths, alpha, n, m, options,
+           mesh_options):
+    # Wing whose k-th segment is meshed with n x m[k] panels
+    pyvlm = PyVLM(**options)
+    pyvlm.add_wing(lead_edge_coord, chord_lengths, n, m, **mesh_options)
+
+    CL, CD = pyvlm.vlm(alpha)
+
+    return pyvlm, CL, CD
+
+
+def refine_mesh(lead_edge_coord, chord_lengths, alpha, n=2, m=2, tol=1e-3,
+                per_segment=False, factor=2, max_panels=4000,
+                targets=('CL', 'CD'), options=None, **mesh_options):
+    """
+    Finds the coarsest mesh of a wing (defined as in PyVLM.add_wing)
+    whose coefficients (CL and CD, or only the target ones) change less
+    than a tolerance when it is refined, starting from a coarse one.
+
+    Every step evaluates the candidate refinements of the current mesh,
+    multiplying the nº of panels by "factor": chordwise and spanwise at
+    once (uniform refinement), or either chordwise or spanwise within a
+    single segment (per segment refinement). The candidate changing the
+    coefficients the most is accepted, until none of them changes them
+    more than the tolerance. Solved meshes are remembered, so candidates
+    discarded in a step are not solved again in the following ones.
+
+    Parameters
+    ----------
+    lead_edge_coord : list (containing arrays)
+                      Coordinates of the leading edge points
+    chord_lengths : list
+                    Chord lenghts corresponding to the sections
+    alpha : float
+            Angle of attack of the wing(degrees)
+    n, m : integer
+           Initial nº of chordwise and spanwise (per segment) panels
+    tol : float
+          Tolerance of the changes of CL and CD
+    per_segment : boolean
+                  Refines either the chordwise density or the
+                  spanwise density of one segment at a time, instead
+                  of everything at once
+    factor : integer
+             Refinement factor of the nº of panels
+    max_panels : integer
+                 Meshes with more panels are not evaluated
+    targets : tuple
+              Coefficients whose convergence is required, "CL" and/or
+              "CD"
+    options : dict, optional
+              Keyword arguments of PyVLM (e.g. the solver)
+    mesh_options : optional
+                   Keyword arguments of PyVLM.add_wing (named spacing
+                   laws only: arrays of positions cannot be refined)
+
+    Returns
+    -------
+    refinement : MeshRefinement
+    """
+
+    if len(lead_edge_coord) != len(chord_lengths):
+        msg = 'Same number of chords and leading edges required'
+        raise ValueError(msg)
+
+    if not targets or not set(targets) <= {'CL', 'CD'}:
+        msg = "Targets should be 'CL' and/or 'CD'"
+        raise ValueError(msg)
+
+    _check_mesh_options(mesh_options)
+
+    options = options or {}
+    monitored = [('CL', 'CD').index(target) for target in targets]
+
+    def n_panels(n, m):
+        return 2 * n * sum(m)
+
+    def candidates(n, m):
+        if not per_segment:
+            return [(n * factor, tuple(m_k * factor for m_k in m))]
+
+        return [(n * factor, m)] + [(n, m[:k] + (m[k] * factor,) + m[k+1:])
+                                    for k in range(len(m))]
+
+    # PyVLM objects and coefficients of the solved meshes
+    solved = {}
+
+    def coefficients(n, m):
+        if (n, m) not in solved:
+            solved[n, m] = _solve(lead_edge_coord, chord_lengths, alpha, n,
+                                  m, options, mesh_options)
+        return solved[n, m][1:]
+
+    m = (m,) * (len(lead_edge_coord) - 1)
+    CL, CD = coefficients(n, m)
+
+    history = [{'n': n, 'm': list(m), 'N': n_panels(n, m), 'CL': CL,
+                'CD': CD, 'change': None}]
+    converged = False
+
+    while True:
+        changes = []
+        for n_, m_ in candidates(n, m):
+            if n_panels(n_, m_) <= max_panels:
+                coeffs = coefficients(n_, m_)
+                change = max(abs(coeffs[i] - (CL, CD)[i]) for i in monitored)
+                changes.append((change, n_, m_))
+
+        if not changes:
+            break
+
+        change, n_, m_ = max(changes, key=lambda x: x[0])
+        if change < tol:
+            converged = True
+            break
+
+        n, m = n_, m_
+        CL, CD = solved[n, m][1:]
+
+        # Only the PyVLM object of the current mesh may be returned, the
+        # rest are released (keeping their coefficients)
+        for key in solved:
+            if key != (n, m):
+                solved[key] = (None,) + solved[key][1:]
+
+        history.append({'n': n, 'm': list(m), 'N': n_panels(n, m),
+                        'CL': CL, 'CD': CD, 'change': change})
+
+    pyvlm = solved[n, m][0]
+
+    return MeshRefinement(pyvlm, n, list(m), CL, CD, history, converged)
+
+
+def _coefficients(lead_edge_coord, chord_lengths, alpha, n, m, options,
+                  mesh_options):
+    return _solve(lead_edge_coord, chord_lengths, alpha, n, m, options,
+                  mesh_options)[1:]
+
+
+def richardson(f, ratio):
+    """
+    Observed order of convergence and Richardson extrapolation of a
+    quantity computed with three meshes, each one "ratio" times finer
+    than the previous one.
+
+    Parameters
+    ----------
+    f : array_like, shape (3,)
+        Values with the coarse, medium and fine meshes
+    ratio : float
+            Refinement ratio
+
+    Returns
+    -------
+    order : float
+            Observed order of convergence (NaN if the convergence is not
+            monotonic)
+    extrapolated : float
+                   Extrapolated value (NaN if the order is)
+    """
+
+    f1, f2, f3 = f
+
+    if f2 == f3:
+        return np.inf, f3
+
+    convergence = (f1 - f2) / (f2 - f3)
+    if convergence <= 1:
+        # oscillatory or diverging sequence
+        return np.nan, np.nan
+
+    order = np.log(convergence) / np.log(ratio)
+    extrapolated = f3 + (f3 - f2) / (ratio**order - 1)
+
+    return order, extrapolated
+
+
+def convergence_study(lead_edge_coord, chord_lengths, alpha, n=2, m=2,
+                      ratio=2, levels=3, n_workers=1, options=None,
+                      **mesh_options):
+    """
+    Solves a wing (defined as in PyVLM.add_wing) with a geometric
+    sequence of meshes, multiplying both n and m by "ratio" at each
+    level, and estimates the converged coefficients by Richardson
+    extrapolation of the three finest ones, along with the observed
+    order of convergence and the error of the finest mesh.
+
+    Parameters
+    ----------
+    lead_edge_coord : list (containing arrays)
+                      Coordinates of the leading edge points
+    chord_lengths : list
+                    Chord lenghts corresponding to the sections
+    alpha : float
+            Angle of attack of the wing(degrees)
+    n, m : integer
+           Nº of chordwise and spanwise (per segment) panels of the
+           coarsest mesh
+    ratio : integer
+            Refinement ratio between consecutive meshes
+    levels : integer
+             Nº of meshes (3 at least)
+    n_workers : integer
+                Number of worker processes solving the meshes at once
+                (with n_workers=1 they are solved in this process)
+    options : dict, optional
+              Keyword arguments of PyVLM (e.g. the solver)
+    mesh_options : optional
+                   Keyword arguments of PyVLM.add_wing (named spacing
+                   laws only: arrays of positions cannot be refined)
+
+    Returns
+    -------
+    study : ConvergenceStudy
+    """
+
+    if levels < 3:
+        msg = 'Three levels of refinement at least are required'
+        raise ValueError(msg)
+
+    if len(lead_edge_coord) != len(chord_lengths):
+        msg = 'Same number of chords and leading edges required'
+        raise ValueError(msg)
+
+    _check_mesh_options(mesh_options)
+
+    options = options or {}
+    n_segments = len(lead_edge_coord) - 1
+
+    n = n * ratio ** np.arange(levels)
+    m = m * ratio ** np.arange(levels)
+    arguments = [(lead_edge_coord, chord_lengths, alpha, int(n_), (int(m_),) *
+                  n_segments, options, mesh_options) for n_, m_ in zip(n, m)]
+
+    if n_workers == 1:
+        coefficients = [_coefficients(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(n_workers) as pool:
+            # finest meshes first, as they take the longest
+            futures = [pool.submit(_coefficients, *args)
+                       for args in arguments[::-1]]
+            coefficients = [future.result() for future in futures[::-1]]
+
+    CL, CD = np.array(coefficients).T
+
+    order = {}
+    extrapolated = {}
+    error = {}
+    for name, f in (('CL', CL), ('CD', CD)):
+        order[name], extrapolated[name] = richardson(f[-3:], ratio)
+        error[name] = abs(extrapolated[name] - f[-1])
+
+    return ConvergenceStudy(n, m, CL, CD, order, extrapolated, error)
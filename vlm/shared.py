@@ -0,0 +1,190 @@
+import sys
+import threading
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+from .vlm import PyVLM
+from .panel import PanelTable
+from .topology import MeshTopology
+
+
+_register_lock = threading.Lock()
+
+
+def _attach(name):
+    # Attaches to an existing segment without registering it with the
+    # resource tracker, which (before Python 3.13) would destroy it when
+    # this process exits. Registering and then unregistering it is not
+    # an option: worker processes may share the tracker of the exporting
+    # process, which would lose its own registration
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+
+    with _register_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedVLM(object):
+    """
+    Solved geometry of a PyVLM (panel arrays, AIC matrix and its
+    factorization) stored in named shared memory segments, so worker
+    processes can attach to it and solve for new right-hand sides
+    without receiving a pickled copy of it.
+
+    Instances are created with "export" (by the owner of the segments)
+    or "attach" (by the other processes, from the "spec" of the
+    exported one, which is small and picklable). Requires Python 3.8
+    or later (multiprocessing.shared_memory).
+
+    Parameters
+    ----------
+    spec : dict
+           Name, shape and dtype of the segment of each array, plus the
+           scalar attributes of the PyVLM and its topology
+    segments : dict
+               SharedMemory object of each array
+    """
+
+    topology = ('vertices', 'panels', 'strip')
+    geometry = ('CP', 'A', 'B', 'area', 'span', 'chordwise_position')
+    solution = ('accul_trail_ind_vel', 'alpha_ind', 'camber_slope', 'AIC',
+                'AIC_inv', 'semispan', 'image')
+
+    def __init__(self, spec, segments):
+        self.spec = spec
+        self.segments = segments
+
+        # Views of the segments, read-only so no process can modify the
+        # solution shared by all of them
+        self.arrays = {}
+        for name, (segment, shape, dtype) in spec['arrays'].items():
+            array = np.ndarray(shape, dtype, buffer=segments[name].buf)
+            array.flags.writeable = False
+            self.arrays[name] = array
+
+    @classmethod
+    def export(cls, pyvlm):
+        """
+        Copies the solved geometry of a PyVLM (dense solver) into new
+        shared memory segments, which have to be released with "unlink"
+        once no process uses them.
+        """
+
+        if type(pyvlm.AIC_inv) == int or pyvlm.solver != 'dense':
+            msg = 'Only PyVLM objects already solved with the dense ' \
+                  'solver can be exported'
+            raise ValueError(msg)
+
+        # The camber gradient is cleared by the changes of the mesh which
+        # keep the factorization (growing or updating it)
+        pyvlm._upstream_normal_velocity(0.0)
+
+        arrays = dict((name, getattr(pyvlm.Topology, name))
+                      for name in cls.topology)
+        arrays.update((name, getattr(pyvlm.Panels, name))
+                      for name in cls.geometry + cls.solution[:2])
+        arrays['camber_slope'] = pyvlm.camber_slope
+        arrays['AIC'] = pyvlm.AIC
+        arrays['AIC_inv'] = pyvlm.AIC_inv
+        if pyvlm.symmetry is not None:
+            arrays['semispan'], arrays['image'] = pyvlm.symmetry
+
+        spec = {'arrays': {}, 'rho': pyvlm.rho,
+                'n_strips': pyvlm.Topology.n_strips,
+                'n_segments': pyvlm.Topology.n_segments}
+        segments = {}
+        try:
+            for name, array in arrays.items():
+                array = np.asarray(array)
+                segment = shared_memory.SharedMemory(
+                    create=True, size=max(array.nbytes, 1))
+                segments[name] = segment
+                np.ndarray(array.shape, array.dtype,
+                           buffer=segment.buf)[...] = array
+                spec['arrays'][name] = (segment.name, array.shape,
+                                        array.dtype.str)
+        except Exception:
+            for segment in segments.values():
+                segment.close()
+                segment.unlink()
+            raise
+
+        return cls(spec, segments)
+
+    @classmethod
+    def attach(cls, spec):
+        """
+        Attaches to the shared memory segments of an exported geometry.
+        The segments are still owned by the exporting process: they are
+        not destroyed when this one exits.
+        """
+
+        segments = {}
+        for name, (segment, _, _) in spec['arrays'].items():
+            segments[name] = _attach(segment)
+
+        return cls(spec, segments)
+
+    def pyvlm(self):
+        """
+        PyVLM solving against the shared geometry: its panel arrays, AIC
+        and factorization are views of the segments (not copies), while
+        the results of each solve are stored in arrays of its own.
+        """
+
+        arrays = self.arrays
+        N = len(arrays['CP'])
+
+        Topology = MeshTopology()
+        for name in self.topology:
+            setattr(Topology, name, arrays[name])
+        Topology.n_strips = self.spec['n_strips']
+        Topology.n_segments = self.spec['n_segments']
+
+        Panels = PanelTable(topology=Topology)
+        for name in self.geometry + self.solution[:2]:
+            setattr(Panels, name, arrays[name])
+        for name in PanelTable.results[2:]:
+            setattr(Panels, name, np.zeros(N))
+
+        pyvlm = PyVLM()
+        pyvlm.Topology = Topology
+        pyvlm.Points = Topology.vertices
+        pyvlm.Panels = Panels
+        pyvlm.rho = self.spec['rho']
+        pyvlm.camber_slope = arrays['camber_slope']
+        pyvlm.AIC = arrays['AIC']
+        pyvlm.AIC_inv = arrays['AIC_inv']
+        if 'semispan' in arrays:
+            pyvlm.symmetric = True
+            pyvlm.symmetry = arrays['semispan'], arrays['image']
+
+        return pyvlm
+
+    def close(self):
+        """
+        Detaches this process from the segments. Every view of them,
+        including the PyVLM objects using them, has to be released
+        first.
+        """
+
+        self.arrays = {}
+        for segment in self.segments.values():
+            segment.close()
+
+    def unlink(self):
+        """
+        Detaches from and destroys the segments (called once, by the
+        process that exported them).
+        """
+
+        segments = self.segments
+        self.close()
+        for segment in segments.values():
+            segment.unlink()
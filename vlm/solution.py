@@ -0,0 +1,172 @@
+import copy
+
+import numpy as np
+
+from .solvers import InfluenceOperator, gmres
+from .treecode import TreecodeOperator
+from .hmatrix import HMatrix
+
+
+def _frozen(array):
+    # Read-only copy, so the solved geometry does not change if the PyVLM
+    # object it comes from is modified afterwards
+    array = np.array(array)
+    array.flags.writeable = False
+
+    return array
+
+
+def _frozen_operator(operator):
+    # Matrix-free AIC evaluated from read-only copies of the arrays of
+    # the given one, which may be modified in place (e.g. moving panels)
+    P, A, B = (_frozen(x) for x in (operator.P, operator.A, operator.B))
+    columns, images = ((None if x is None else _frozen(x))
+                       for x in (operator.columns, operator.images))
+
+    if isinstance(operator, TreecodeOperator):
+        return TreecodeOperator(P, A, B, columns, images,
+                                operator.tree.theta)
+
+    return InfluenceOperator(P, A, B, columns, images, operator.block_size,
+                             operator.n_workers)
+
+
+class VLMResult(object):
+    """
+    Results of the VLM for one angle of attack, owned by the caller.
+
+    Parameters
+    ----------
+    alpha : float
+            Angle of attack of the wing(degrees)
+    CL, CD : float
+             Lift and drag coefficients of the wing
+    gamma, l, d, cl, cd : ndarray, shape (N,)
+                          Circulation, lift, drag and lift and drag
+                          coefficients of each panel
+    solver_info : dict, optional
+                  Iterations and residual of the iterative solvers
+    """
+
+    def __init__(self, alpha, CL, CD, gamma, l, d, cl, cd,
+                 solver_info=None):
+        self.alpha = alpha
+        self.CL = CL
+        self.CD = CD
+        self.gamma = gamma
+        self.l = l
+        self.d = d
+        self.cl = cl
+        self.cd = cd
+        self.solver_info = solver_info
+
+
+class SolvedWing(object):
+    """
+    Immutable snapshot of the geometry, AIC matrix and factorization of
+    a PyVLM. Solving for an angle of attack does not modify it, but
+    returns a new VLMResult, so a single SolvedWing can serve concurrent
+    solves from several threads (NumPy releases the GIL during the
+    matrix products).
+
+    Parameters
+    ----------
+    pyvlm : PyVLM
+            Lifting surface, whose AIC and factorization are computed
+            if they are not yet available
+    """
+
+    def __init__(self, pyvlm):
+        # Whatever is missing is computed first: AIC, induced velocity by
+        # the trailing vortices, camber gradient and factorization (or
+        # preconditioner)
+        pyvlm._assemble_aic()
+        pyvlm._upstream_normal_velocity(0.0)
+        pyvlm._factorize()
+
+        Panel = pyvlm.Panels
+
+        self.rho = pyvlm.rho
+        self.solver = pyvlm.solver
+        self.tol = pyvlm.tol
+
+        self.N = len(Panel)
+        self.area = _frozen(Panel.area)
+        self.span = _frozen(Panel.span)
+        self.accul_trail_ind_vel = _frozen(Panel.accul_trail_ind_vel)
+        self.camber_slope = _frozen(pyvlm.camber_slope)
+
+        self.symmetry = None
+        if pyvlm.symmetry is not None:
+            self.symmetry = tuple(_frozen(x) for x in pyvlm.symmetry)
+
+        if self.solver == 'dense':
+            self.AIC = None
+            self.AIC_inv = _frozen(pyvlm.AIC_inv)
+            return
+
+        # The matrix-free operators reference the panel arrays, so they
+        # are built again from copies of them. The H-matrix blocks and
+        # the preconditioner are arrays of their own, never modified in
+        # place, so they are shared. The out-of-core AIC is shared as
+        # well: its file must not be assembled again while in use
+        AIC = pyvlm.AIC
+        if isinstance(AIC, InfluenceOperator):
+            AIC = _frozen_operator(AIC)
+        elif isinstance(AIC, HMatrix):
+            AIC = copy.copy(AIC)
+            AIC.operator = _frozen_operator(AIC.operator)
+
+        self.AIC = AIC
+        self.AIC_inv = pyvlm.AIC_inv
+
+    def solve(self, alpha):
+        """
+        Applies the VLM theory for the given angle of attack.
+
+        Parameters
+        ----------
+        alpha : float
+                Angle of attack of the wing(degrees)
+
+        Returns
+        -------
+        result : VLMResult
+        """
+
+        rho = self.rho
+        V = 1.0
+
+        q_inf = (1 / 2) * rho * (V**2)
+
+        Vinf_n = -V * (np.deg2rad(alpha) - self.camber_slope)
+
+        solver_info = None
+        if self.symmetry is None:
+            Vinf_n_ = Vinf_n
+        else:
+            Vinf_n_ = Vinf_n[self.symmetry[0]]
+
+        if self.solver == 'dense':
+            gamma = self.AIC_inv @ Vinf_n_
+        else:
+            gamma, solver_info = gmres(self.AIC, Vinf_n_, self.AIC_inv,
+                                       self.tol)
+
+        if self.symmetry is not None:
+            semispan, image = self.symmetry
+            gamma_ = np.empty(self.N)
+            gamma_[semispan] = gamma
+            gamma_[image] = gamma
+            gamma = gamma_
+
+        l = V * rho * gamma * self.span
+        d = -rho * abs(gamma) * self.span * self.accul_trail_ind_vel
+        cl = l / (q_inf * self.area)
+        cd = d / (q_inf * self.area)
+
+        S = self.area.sum()
+        CL = l.sum() / (q_inf * S)
+        CD = d.sum() / (q_inf * S)
+
+        return VLMResult(alpha, CL, CD, gamma, l, d, cl, cd, solver_info)
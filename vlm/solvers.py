@@ -0,0 +1,354 @@
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .vortices import v_induced_by_horseshoe_vortices
+
+
+class InfluenceOperator(object):
+    """
+    Matrix-free representation of the AIC matrix: the product AIC·x is
+    computed on the fly from the batched horseshoe vortex kernel, in
+    blocks of rows, so the full matrix is never stored unless it is
+    explicitly assembled.
+
+    Each unknown (column) may be shared by two horseshoe vortices, a
+    panel and its specular image, as in the symmetric solve.
+
+    The blocks of rows are evaluated in a pool of threads (NumPy
+    releases the GIL in the kernel operations), each one writing its own
+    rows of the output, so results do not depend on the number of
+    workers.
+
+    Parameters
+    ----------
+    P : array_like, shape (n, 2)
+        Control points where the induced velocity is evaluated (rows)
+    A, B : array_like, shape (N, 2)
+           Points of the horseshoe vortices
+    columns : array_like, shape (n,), optional
+              Horseshoe vortex of each unknown (all of them by default)
+    images : array_like, shape (n,), optional
+             Specular image of the horseshoe vortex of each unknown
+    block_size : integer
+                 Number of rows evaluated at once
+    n_workers : integer
+                Number of threads evaluating blocks of rows
+    """
+
+    def __init__(self, P, A, B, columns=None, images=None, block_size=128,
+                 n_workers=1):
+        self.P = P
+        self.A = A
+        self.B = B
+
+        self.columns = columns
+        self.images = images
+        self.block_size = block_size
+        self.n_workers = n_workers
+
+        n = len(A) if columns is None else len(columns)
+        self.shape = (len(P), n)
+
+    def _map_rows(self, function, block_size=None):
+        # Calls function(rows) for every block of rows
+        block_size = block_size or self.block_size
+        blocks = [slice(k, k + block_size)
+                  for k in range(0, self.shape[0], block_size)]
+
+        if self.n_workers > 1 and len(blocks) > 1:
+            with ThreadPoolExecutor(self.n_workers) as pool:
+                list(pool.map(function, blocks))
+        else:
+            for rows in blocks:
+                function(rows)
+
+    def _fold(self, W):
+        # Influence on the unknowns of the influence of all the horseshoes
+        if self.columns is None:
+            return W
+
+        W_ = W[:, self.columns]
+        if self.images is not None:
+            W_ += W[:, self.images]
+
+        return W_
+
+    def _horseshoe_strength(self, x):
+        # Circulation of every horseshoe vortex for a given set of unknowns
+        if self.columns is None:
+            return x
+
+        gamma = np.zeros((len(self.A),) + x.shape[1:])
+        gamma[self.columns] = x
+        if self.images is not None:
+            gamma[self.images] += x
+
+        return gamma
+
+    def __matmul__(self, x):
+        x = np.asarray(x, dtype=float)
+        gamma = self._horseshoe_strength(x)
+
+        y = np.empty((self.shape[0],) + x.shape[1:])
+
+        def product(rows):
+            W, _ = v_induced_by_horseshoe_vortices(self.P[rows], self.A,
+                                                   self.B)
+            y[rows] = W @ gamma
+
+        self._map_rows(product)
+
+        return y
+
+    def trailing_velocity(self):
+        """
+        Induced velocity by *only* the trailing vortices (of strength=1)
+        of all the horseshoes, on each control point.
+        """
+
+        Wi = np.empty(self.shape[0])
+
+        def trailing(rows):
+            _, W_trail = v_induced_by_horseshoe_vortices(self.P[rows],
+                                                         self.A, self.B)
+            Wi[rows] = W_trail.sum(axis=1)
+
+        self._map_rows(trailing)
+
+        return Wi
+
+    def assemble(self):
+        """
+        Dense AIC matrix and induced velocity by *only* the trailing
+        vortices on each control point, computed in a single pass.
+        """
+
+        AIC = np.empty(self.shape)
+        Wi = np.empty(self.shape[0])
+
+        def fill(rows):
+            W, W_trail = v_induced_by_horseshoe_vortices(self.P[rows],
+                                                         self.A, self.B)
+            AIC[rows] = self._fold(W)
+            Wi[rows] = W_trail.sum(axis=1)
+
+        self._map_rows(fill)
+
+        return AIC, Wi
+
+    def assemble_tiled(self, out, tile_size=512):
+        """
+        Assembles the AIC matrix into a given array (e.g. a memory-mapped
+        file) in square tiles, so the memory in use only depends on the
+        tile size. Returns the induced velocity by *only* the trailing
+        vortices on each control point.
+        """
+
+        n = self.shape[1]
+        Wi = np.zeros(self.shape[0])
+
+        def fill(rows):
+            for k in range(0, n, tile_size):
+                cols = np.arange(k, min(k + tile_size, n))
+                W, W_trail = self._tile(rows, cols)
+                out[rows, k:k + tile_size] = W
+                Wi[rows] += W_trail.sum(axis=1)
+
+        self._map_rows(fill, tile_size)
+
+        return Wi
+
+    def _tile(self, rows, cols):
+        # Block AIC[rows, cols] and induced velocity by the trailing
+        # vortices of the horseshoes of those unknowns
+        A, B = self.A, self.B
+
+        horseshoes = cols if self.columns is None else self.columns[cols]
+        W, W_trail = v_induced_by_horseshoe_vortices(self.P[rows],
+                                                     A[horseshoes],
+                                                     B[horseshoes])
+        if self.images is not None:
+            horseshoes = self.images[cols]
+            W_, W_trail_ = v_induced_by_horseshoe_vortices(self.P[rows],
+                                                           A[horseshoes],
+                                                           B[horseshoes])
+            W += W_
+            W_trail += W_trail_
+
+        return W, W_trail
+
+    def block(self, rows, cols):
+        """
+        Dense block AIC[rows, cols] of the operator.
+        """
+
+        return self._tile(rows, cols)[0]
+
+
+class OutOfCoreMatrix(object):
+    """
+    Matrix stored in a (memory-mapped) file. Its products are computed
+    streaming blocks of rows, so no more than a given amount of memory
+    is used to hold parts of it at any time.
+
+    Parameters
+    ----------
+    matrix : numpy.memmap
+             Matrix stored on disk
+    memory_budget : integer
+                    Memory available for blocks of the matrix (bytes)
+    """
+
+    def __init__(self, matrix, memory_budget=2**28):
+        self.matrix = matrix
+        self.shape = matrix.shape
+
+        row_size = matrix.shape[1] * matrix.itemsize
+        self.block_size = max(1, memory_budget // row_size)
+
+    def __matmul__(self, x):
+        y = np.empty((self.shape[0],) + np.shape(x)[1:])
+        for k in range(0, self.shape[0], self.block_size):
+            rows = slice(k, k + self.block_size)
+            y[rows] = np.asarray(self.matrix[rows]) @ x
+
+        return y
+
+    def block(self, rows, cols):
+        """
+        Dense block [rows, cols] of the matrix, read from disk.
+        """
+
+        return np.asarray(self.matrix[np.ix_(rows, cols)])
+
+
+class BlockJacobi(object):
+    """
+    Block-diagonal preconditioner: the inverse of the diagonal blocks of
+    the AIC defined by groups of unknowns (e.g. the panels of a strip).
+
+    Parameters
+    ----------
+    AIC : array_like or InfluenceOperator
+          Matrix of the linear system
+    groups : list (containing arrays)
+             Indices of the unknowns in each block
+    """
+
+    def __init__(self, AIC, groups):
+        self.blocks = []
+
+        # Blocks of the same size are inverted and applied stacked
+        sizes = np.array([len(group) for group in groups])
+        for size in np.unique(sizes):
+            index = np.array([groups[k]
+                              for k in np.flatnonzero(sizes == size)])
+            if isinstance(AIC, np.ndarray):
+                blocks = AIC[index[:, :, np.newaxis], index[:, np.newaxis, :]]
+            else:
+                blocks = np.array([AIC.block(group, group) for group in index])
+            self.blocks.append((index, np.linalg.inv(blocks)))
+
+    def __call__(self, x):
+        y = np.empty_like(x)
+        for index, blocks_inv in self.blocks:
+            y[index] = np.einsum('kij,kj->ki', blocks_inv, x[index])
+
+        return y
+
+
+def gmres(A, b, M=None, tol=1e-8, restart=50, maxiter=1000):
+    """
+    Restarted GMRES with right preconditioning. Only products A @ x are
+    required, so A may be a matrix-free operator.
+
+    Parameters
+    ----------
+    A : array_like or InfluenceOperator
+        Matrix of the linear system
+    b : array_like, shape (n,)
+        Right-hand side
+    M : callable, optional
+        Preconditioner, approximation of the inverse of A
+    tol : float
+          Relative tolerance on the residual norm
+    restart : integer
+              Iterations between restarts
+    maxiter : integer
+              Maximum number of iterations
+
+    Returns
+    -------
+    x : ndarray, shape (n,)
+        Solution
+    info : dict
+        Number of iterations and relative residual norm reached
+
+    A RuntimeWarning is issued if the tolerance is not met within
+    maxiter iterations.
+    """
+
+    if M is None:
+        def M(x):
+            return x
+
+    b = np.asarray(b, dtype=float)
+    b_norm = np.linalg.norm(b)
+
+    x = np.zeros_like(b)
+    if b_norm == 0:
+        return x, {'iterations': 0, 'residual': 0.0}
+
+    iterations = 0
+    while True:
+        r = b - A @ x
+        beta = np.linalg.norm(r)
+        if beta <= tol * b_norm or iterations >= maxiter:
+            break
+
+        V = np.zeros((restart + 1, len(b)))
+        H = np.zeros((restart + 1, restart))
+        cs = np.zeros(restart)
+        sn = np.zeros(restart)
+        g = np.zeros(restart + 1)
+
+        V[0] = r / beta
+        g[0] = beta
+
+        for j in range(restart):
+            w = A @ M(V[j])
+
+            # Arnoldi process (modified Gram-Schmidt)
+            for i in range(j + 1):
+                H[i, j] = w @ V[i]
+                w -= H[i, j] * V[i]
+            H[j + 1, j] = np.linalg.norm(w)
+            if H[j + 1, j] != 0:
+                V[j + 1] = w / H[j + 1, j]
+
+            # Givens rotations to keep H upper triangular
+            for i in range(j):
+                H[i, j], H[i + 1, j] = (cs[i]*H[i, j] + sn[i]*H[i + 1, j],
+                                        -sn[i]*H[i, j] + cs[i]*H[i + 1, j])
+            rho = np.hypot(H[j, j], H[j + 1, j])
+            cs[j], sn[j] = H[j, j] / rho, H[j + 1, j] / rho
+            H[j, j], H[j + 1, j] = rho, 0
+            g[j], g[j + 1] = cs[j]*g[j], -sn[j]*g[j]
+
+            iterations += 1
+            if abs(g[j + 1]) <= tol * b_norm or iterations >= maxiter:
+                break
+
+        k = j + 1
+        y = np.linalg.solve(H[:k, :k], g[:k])
+        x += M(V[:k].T @ y)
+
+    residual = beta / b_norm
+    if residual > tol:
+        msg = 'GMRES did not converge: relative residual %.3g after %d ' \
+              'iterations (tol=%.3g)' % (residual, iterations, tol)
+        warnings.warn(msg, RuntimeWarning)
+
+    return x, {'iterations': iterations, 'residual': residual}
@@ -0,0 +1,118 @@
+import sys
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .vlm import PyVLM
+
+
+def _solve_geometry(wing, params, alphas, panel_results, options):
+    # Solves all the angles of attack of a geometry with a single AIC
+    # and factorization
+    pyvlm = PyVLM(**options)
+    pyvlm.add_wing(*wing(**params))
+
+    return pyvlm.vlm_sweep(alphas, panel_forces=panel_results)
+
+
+def parameter_sweep(wing, grid, n_workers=None, panel_results=False,
+                    progress=True, options=None):
+    """
+    Runs the VLM over every combination (case) of the values in a grid of
+    parameters, e.g. span, taper, sweep, mesh density and angle of attack,
+    fanning the cases out over a pool of processes.
+
+    Cases are grouped by geometry (all the parameters but "alpha"), so
+    each worker assembles and factorizes one AIC and solves all the
+    angles of attack of that geometry against it. Results are collected
+    as they are completed, reporting the progress and throughput.
+
+    Parameters
+    ----------
+    wing : callable
+           Function of the geometry parameters returning the arguments of
+           PyVLM.add_wing: (lead_edge_coord, chord_lengths, n, m). It has
+           to be defined at module level, so it can be sent to workers
+    grid : dict
+           Values of each parameter. The angles of attack (degrees) are
+           given by the key "alpha" (0 by default)
+    n_workers : integer, optional
+                Number of worker processes (as many as CPUs by default).
+                With n_workers=1 the cases are run in this process
+    panel_results : boolean
+                    Also collects the lift and drag coefficients of each
+                    panel
+    progress : boolean
+               Prints the progress and throughput of the sweep
+    options : dict, optional
+              Keyword arguments of PyVLM (e.g. the solver)
+
+    Returns
+    -------
+    table : dict
+            Columns of results, one row per case: the value of each
+            parameter, "CL" and "CD" (and arrays "cl" and "cd" of the
+            panels, if requested)
+    """
+
+    grid = dict(grid)
+    alphas = np.atleast_1d(grid.pop('alpha', 0))
+    options = options or {}
+
+    names = list(grid)
+    geometries = [dict(zip(names, values))
+                  for values in itertools.product(*grid.values())]
+
+    n_cases = len(geometries) * len(alphas)
+
+    columns = names + ['alpha', 'CL', 'CD']
+    if panel_results:
+        columns += ['cl', 'cd']
+    table = dict((name, [None] * n_cases) for name in columns)
+
+    def store(k, result):
+        # rows of the k-th geometry, in the order of the grid
+        for i, alpha in enumerate(alphas):
+            row = k * len(alphas) + i
+            for name in names:
+                table[name][row] = geometries[k][name]
+            table['alpha'][row] = alpha
+            table['CL'][row] = result[0][i]
+            table['CD'][row] = result[1][i]
+            if panel_results:
+                table['cl'][row] = result[2][:, i]
+                table['cd'][row] = result[3][:, i]
+
+    def report(done, start):
+        if progress:
+            elapsed = time.time() - start
+            cases = done * len(alphas)
+            sys.stderr.write('\r%d/%d cases (%.1f cases/s)'
+                             % (cases, n_cases, cases / max(elapsed, 1e-9)))
+            if done == len(geometries):
+                sys.stderr.write('\n')
+            sys.stderr.flush()
+
+    start = time.time()
+
+    if n_workers == 1:
+        for k, params in enumerate(geometries):
+            store(k, _solve_geometry(wing, params, alphas, panel_results,
+                                     options))
+            report(k + 1, start)
+    else:
+        with ProcessPoolExecutor(n_workers) as pool:
+            futures = dict((pool.submit(_solve_geometry, wing, params,
+                                        alphas, panel_results, options), k)
+                           for k, params in enumerate(geometries))
+            for done, future in enumerate(as_completed(futures), 1):
+                store(futures[future], future.result())
+                report(done, start)
+
+    for name in columns:
+        if name not in ('cl', 'cd'):
+            table[name] = np.array(table[name])
+
+    return table
@@ -0,0 +1,208 @@
+import numpy as np
+
+
+class MeshTopology(object):
+    """
+    Indexed mesh of a set of panels: a single array of vertices, shared
+    by all the panels touching them (also across the boundaries of the
+    wing segments and the symmetry plane), plus the indices of the
+    corner points of each panel and the spanwise strip and wing segment
+    each panel belongs to.
+
+    Parameters
+    ----------
+    decimals : integer
+               Vertices closer than 10**-decimals (relative to the size
+               of the mesh) are merged into one
+    """
+
+    def __init__(self, decimals=9):
+        self.decimals = decimals
+
+        self.vertices = np.empty((0, 2))
+        self.panels = np.empty((0, 4), dtype=int)  # P1, P2, P3, P4
+        self.strip = np.empty(0, dtype=int)
+        self.segment = np.empty(0, dtype=int)
+
+        self.n_strips = 0
+        self.n_segments = 0
+
+        self._neighbours = None
+        self._strip_index = None
+
+    def add(self, points, panels, m, strip=None):
+        """
+        Adds a wing segment, merging its points with the existing
+        vertices.
+
+        Parameters
+        ----------
+        points : array_like, shape (Np, 2)
+                 Points of the segment
+        panels : array_like, shape (NP, 4)
+                 Indices of the corner points of each panel in "points"
+        m : integer
+            Number of spanwise strips of the segment, the panels being
+            ordered chordwise row by row
+        strip : array_like, shape (NP,), optional
+                Strip of each panel within the segment, if they are not
+                ordered that way
+
+        Returns
+        -------
+        index : ndarray, shape (Np,)
+                Index of each point in the array of vertices
+        """
+
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        panels = np.asarray(panels)
+        N0 = len(self.vertices)
+
+        vertices = np.concatenate((self.vertices, points))
+
+        # Points are compared rounded (adding 0 so that -0.0 == 0.0),
+        # relative to the size of the mesh
+        scale = abs(vertices).max() or 1
+        key = np.round(vertices / scale, self.decimals) + 0.0
+        _, first, inverse = np.unique(key, axis=0, return_index=True,
+                                      return_inverse=True)
+
+        # Vertices are numbered in order of appearance, so the existing
+        # ones keep their indices
+        order = np.argsort(first)
+        number = np.empty_like(order)
+        number[order] = np.arange(len(order))
+        index = number[inverse.ravel()][N0:]
+
+        self.vertices = vertices[first[order]]
+        self.panels = np.concatenate((self.panels, index[panels]))
+        if strip is None:
+            strip = np.arange(len(panels)) % m
+        self.strip = np.concatenate((self.strip, self.n_strips +
+                                     np.asarray(strip, dtype=int)))
+        self.segment = np.concatenate((self.segment,
+                                       np.full(len(panels),
+                                               self.n_segments)))
+
+        self.n_strips += m
+        self.n_segments += 1
+
+        self._neighbours = None
+        self._strip_index = None
+
+        return index
+
+    def move(self, indices, P1, P2, P3, P4):
+        """
+        Moves the corner points of some panels. Vertices shared with
+        panels which are not moved keep their position: the moved
+        panels are detached from them onto new vertices (or onto
+        existing ones at their new position).
+
+        Raises ValueError if the moved panels give different positions
+        to one of their shared vertices.
+        """
+
+        indices = np.atleast_1d(indices)
+        corners = self.panels[indices].ravel()
+        positions = np.stack([np.asarray(P, dtype=float).reshape(-1, 2)
+                              for P in (P1, P2, P3, P4)],
+                             axis=1).reshape(-1, 2)
+
+        # Position of each moved vertex, which has to be the same for all
+        # the moved panels sharing it
+        vertex, first, inverse = np.unique(corners, return_index=True,
+                                           return_inverse=True)
+        position = positions[first]
+        if not np.allclose(positions, position[inverse.ravel()], rtol=0,
+                           atol=1e-12 * (abs(self.vertices).max() or 1)):
+            msg = 'Moved panels give different positions to a shared vertex'
+            raise ValueError(msg)
+
+        moved = (position != self.vertices[vertex]).any(axis=1)
+        vertex, position = vertex[moved], position[moved]
+
+        # Vertices also used by panels which stay in place
+        others = np.ones(len(self.panels), dtype=bool)
+        others[indices] = False
+        shared = np.isin(vertex, self.panels[others])
+
+        self.vertices[vertex[~shared]] = position[~shared]
+
+        if shared.any():
+            N0 = len(self.vertices)
+            vertices = np.concatenate((self.vertices, position[shared]))
+
+            # Detached vertices are merged with any other at the same
+            # position (and new ones numbered after the existing ones)
+            scale = abs(vertices).max() or 1
+            key = np.round(vertices / scale, self.decimals) + 0.0
+            _, first, inverse = np.unique(key, axis=0, return_index=True,
+                                          return_inverse=True)
+            index = first[inverse.ravel()][N0:]
+
+            added = np.unique(index[index >= N0])
+            index[index >= N0] = N0 + np.searchsorted(added,
+                                                      index[index >= N0])
+
+            remap = np.arange(N0)
+            remap[vertex[shared]] = index
+            self.panels[indices] = remap[self.panels[indices]]
+            self.vertices = np.concatenate((self.vertices, vertices[added]))
+
+            self._neighbours = None
+
+    @property
+    def neighbours(self):
+        """
+        Panel across each side of every panel, array of shape (N, 4):
+        sides P1P2 and P3P4 (spanwise neighbours), P2P3 (upstream) and
+        P4P1 (downstream). -1 stands for no neighbour.
+        """
+
+        if self._neighbours is None:
+            N = len(self.panels)
+
+            edges = np.stack((self.panels, np.roll(self.panels, -1, axis=1)),
+                             axis=-1).reshape(-1, 2)
+            edges.sort(axis=1)
+
+            neighbours = np.full(4 * N, -1)
+            if N > 0:
+                _, edge = np.unique(edges, axis=0, return_inverse=True)
+                edge = edge.ravel()
+
+                # Each side shared by two panels appears twice in a row
+                order = np.argsort(edge, kind='stable')
+                shared = edge[order[1:]] == edge[order[:-1]]
+                a, b = order[:-1][shared], order[1:][shared]
+                neighbours[a] = b // 4
+                neighbours[b] = a // 4
+
+            self._neighbours = neighbours.reshape(N, 4)
+
+        return self._neighbours
+
+    def strip_panels(self, strip):
+        """
+        Panels of a spanwise strip.
+        """
+
+        if self._strip_index is None:
+            order = np.argsort(self.strip, kind='stable')
+            start = np.searchsorted(self.strip[order],
+                                    np.arange(self.n_strips + 1))
+            self._strip_index = order, start
+
+        order, start = self._strip_index
+
+        return order[start[strip]:start[strip + 1]]
+
+    def strip_sum(self, values):
+        """
+        Sum of the values (indexed by panel) of the panels of each
+        spanwise strip.
+        """
+
+        return np.bincount(self.strip, weights=values,
+                           minlength=self.n_strips)
@@ -0,0 +1,241 @@
+import numpy as np
+
+from .vortices import v_induced_by_horseshoe_vortices
+from .hmatrix import Cluster
+from .solvers import InfluenceOperator
+
+
+def _trailing_kernel(d):
+    # Induced velocity by a trailing vortex of strength=1 starting at the
+    # origin and extended to x_Inf(+), at points d
+    dx, dy = d[..., 0], d[..., 1]
+    r = (dx**2 + dy**2)**0.5
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v = (dx + r) / (dy * r)
+
+    return np.where(dy == 0, 0, v) / (4*np.pi)
+
+
+def _bounded_kernels(d):
+    # Induced velocity at points d by a short bounded vortex at the origin,
+    # per unit of its x and y components (circulation times length)
+    dx, dy = d[..., 0], d[..., 1]
+    r3 = (dx**2 + dy**2)**1.5
+
+    return dy / (4*np.pi*r3), -dx / (4*np.pi*r3)
+
+
+def _chebyshev_basis(t, nodes):
+    # Lagrange polynomials on the given nodes, evaluated at t
+    S = np.ones((len(t), len(nodes)))
+    for k in range(len(nodes)):
+        for m in range(len(nodes)):
+            if m != k:
+                S[:, k] *= (t - nodes[m]) / (nodes[k] - nodes[m])
+
+    return S
+
+
+class HorseshoeTree(object):
+    """
+    Tree-code (Barnes-Hut) evaluation of the velocity induced by a set of
+    horseshoe vortices at many points, in O((N+M)·log N) operations.
+
+    The horseshoes are arranged in a cluster tree. For points far enough
+    from a cluster (its size below theta times their distance) the
+    cluster is replaced by an aggregated far-field expansion, while near
+    points are evaluated with the exact kernel of the vortices module.
+
+    Each horseshoe is split into its trailing vortices, which are point
+    sources of the trailing kernel at A and B, and its bounded vortex,
+    taken as a point source at its midpoint. The sources of each cluster
+    are aggregated on a grid of order x order Chebyshev nodes spanning
+    it, which are then evaluated as the equivalent sources. Since the
+    trailing vortices extend to x_Inf(+), points in the wake of a
+    cluster (downstream of it, within its spanwise range) are never
+    considered far from it, wherever they are.
+
+    Parameters
+    ----------
+    A, B : array_like, shape (N, 2)
+           Points of the horseshoe vortices
+    theta : float
+            Opening angle: accuracy parameter of the approximation
+    order : integer
+            Number of Chebyshev nodes per direction of the expansions
+    leaf_size : integer
+                Maximum number of horseshoes of a leaf of the tree
+    """
+
+    def __init__(self, A, B, theta=0.5, order=4, leaf_size=32):
+        self.A = np.asarray(A, dtype=float)
+        self.B = np.asarray(B, dtype=float)
+        self.theta = theta
+
+        M = (self.A + self.B) / 2
+
+        self.root = Cluster(M, np.arange(len(M)), leaf_size)
+
+        # Chebyshev nodes on [-1, 1]
+        t = np.cos((2*np.arange(order) + 1) * np.pi / (2*order))
+
+        self._nodes = []
+        self._setup(self.root, t)
+
+    def _setup(self, cluster, t):
+        # Bounding box, Chebyshev nodes and interpolation basis of the
+        # sources of each cluster
+        h = cluster.indices
+        A, B = self.A[h], self.B[h]
+        M = (A + B) / 2
+
+        P = np.concatenate((A, B))
+        lo, hi = P.min(axis=0), P.max(axis=0)
+        size = np.linalg.norm(hi - lo)
+
+        center = (lo + hi) / 2
+        half = np.maximum((hi - lo) / 2, 1e-6 * size + 1e-12)
+        nodes_x = center[0] + half[0] * t
+        nodes_y = center[1] + half[1] * t
+
+        cluster.box = lo, hi
+        cluster.size = size
+        cluster.nodes = np.array(np.meshgrid(nodes_x, nodes_y,
+                                             indexing='ij')).reshape(2, -1).T
+
+        cluster.basis = [(_chebyshev_basis(Q[:, 0], nodes_x),
+                          _chebyshev_basis(Q[:, 1], nodes_y))
+                         for Q in (A, B, M)]
+
+        for child in cluster.children:
+            self._setup(child, t)
+
+    def _weights(self, cluster, gamma, trailing):
+        # Equivalent sources of a cluster on its Chebyshev nodes:
+        # trailing vortices strength and bounded vortices x, y components
+        h = cluster.indices
+        g = gamma[h]
+        (SAx, SAy), (SBx, SBy), (SMx, SMy) = cluster.basis
+
+        W_trail = (SBx.T * g) @ SBy - (SAx.T * g) @ SAy
+        if trailing:
+            return W_trail.ravel(), None, None
+
+        T = (self.B[h] - self.A[h]) * g[:, np.newaxis]
+        W_x = (SMx.T * T[:, 0]) @ SMy
+        W_y = (SMx.T * T[:, 1]) @ SMy
+
+        return W_trail.ravel(), W_x.ravel(), W_y.ravel()
+
+    def _far(self, cluster, P):
+        # Points far enough from the cluster, whose trailing vortices
+        # extend from its box to x_Inf(+): the trailing kernel is singular
+        # all along its wake, so no point downstream of the cluster and
+        # within its spanwise range is ever far from it
+        lo, hi = cluster.box
+        hi = np.array([np.inf, hi[1]])
+
+        gap = np.maximum(0, np.maximum(lo - P, P - hi))
+        distance = np.linalg.norm(gap, axis=1)
+
+        return cluster.size < self.theta * distance
+
+    def induced_velocity(self, P, gamma, trailing=False):
+        """
+        Induced velocity at points P by the horseshoe vortices of
+        strength gamma (or, if trailing is True, by *only* their
+        trailing vortices).
+
+        Parameters
+        ----------
+        P : array_like, shape (M, 2)
+            Points of reference
+        gamma : array_like, shape (N,)
+                Circulation of each horseshoe vortex
+        trailing : boolean
+                   Only the trailing vortices are considered
+
+        Returns
+        -------
+        v : ndarray, shape (M,)
+        """
+
+        P = np.asarray(P, dtype=float)
+        gamma = np.asarray(gamma, dtype=float)
+
+        v = np.zeros(len(P))
+        stack = [(self.root, np.arange(len(P)))]
+
+        while stack:
+            cluster, targets = stack.pop()
+            if len(targets) == 0:
+                continue
+
+            far = self._far(cluster, P[targets])
+            if far.any():
+                i = targets[far]
+                W_trail, W_x, W_y = self._weights(cluster, gamma, trailing)
+                d = P[i, np.newaxis, :] - cluster.nodes[np.newaxis, :, :]
+                v[i] += _trailing_kernel(d) @ W_trail
+                if not trailing:
+                    K_x, K_y = _bounded_kernels(d)
+                    v[i] += K_x @ W_x + K_y @ W_y
+
+            near = targets[~far]
+            if not cluster.children:
+                h = cluster.indices
+                W, W_trail = v_induced_by_horseshoe_vortices(P[near],
+                                                             self.A[h],
+                                                             self.B[h])
+                v[near] += (W_trail if trailing else W) @ gamma[h]
+            else:
+                for child in cluster.children:
+                    stack.append((child, near))
+
+        return v
+
+
+class TreecodeOperator(InfluenceOperator):
+    """
+    Matrix-free AIC whose products are approximated by a HorseshoeTree,
+    in O(N·log N) operations instead of O(N²). Its blocks (e.g. for the
+    preconditioner) are still computed exactly.
+
+    Parameters
+    ----------
+    P : array_like, shape (n, 2)
+        Control points where the induced velocity is evaluated (rows)
+    A, B : array_like, shape (N, 2)
+           Points of the horseshoe vortices
+    columns : array_like, shape (n,), optional
+              Horseshoe vortex of each unknown (all of them by default)
+    images : array_like, shape (n,), optional
+             Specular image of the horseshoe vortex of each unknown
+    theta : float
+            Opening angle of the tree-code
+    """
+
+    def __init__(self, P, A, B, columns=None, images=None, theta=0.5):
+        super(TreecodeOperator, self).__init__(P, A, B, columns, images)
+
+        self.tree = HorseshoeTree(A, B, theta)
+
+    def __matmul__(self, x):
+        x = np.asarray(x, dtype=float)
+        gamma = self._horseshoe_strength(x)
+
+        if x.ndim == 1:
+            return self.tree.induced_velocity(self.P, gamma)
+
+        return np.array([self.tree.induced_velocity(self.P, g)
+                         for g in gamma.T]).T
+
+    def trailing_velocity(self):
+        """
+        Induced velocity by *only* the trailing vortices (of strength=1)
+        of all the horseshoes, on each control point.
+        """
+
+        return self.tree.induced_velocity(self.P, np.ones(len(self.A)),
+                                          trailing=True)
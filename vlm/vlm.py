@@ -1,9 +1,17 @@
+import tempfile
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-from .panel import Panel
-from .mesh_generator import Mesh
+from .panel import PanelTable
+from .mesh_generator import Mesh, spacing
+from .topology import MeshTopology
 from .airfoils import NACA4
+from .hmatrix import HMatrix
+from .solution import SolvedWing
+from .treecode import TreecodeOperator
+from .solvers import (InfluenceOperator, OutOfCoreMatrix, BlockJacobi,
+                      gmres)
 
 
 class PyVLM(object):
@@ -11,28 +19,102 @@ class PyVLM(object):
     Given a geometry, mesh chordwise and spanwise densities, angle of
     attack, upstream velocity, applies the VLM theory to the
     defined lifting surface.
+
+    Parameters
+    ----------
+    cache : AICCache, optional
+            On-disk cache where the AIC matrix and its factorization are
+            looked up before being computed, and stored afterwards
+    symmetric : boolean
+                Takes advantage of the symmetry of the wing, solving only
+                for one semi-span: the influence of its specular image is
+                folded into a reduced N/2 x N/2 AIC. The full system is
+                used if the mesh is not symmetric.
+    solver : string
+             'dense' (default) stores and factorizes the AIC matrix, while
+             'gmres' never forms it: the system is solved iteratively,
+             computing the AIC products from the horseshoe vortex kernel
+             and using the spanwise strips as block-diagonal
+             preconditioner. 'out-of-core' assembles the AIC in tiles
+             into a memory-mapped file and solves it iteratively too,
+             reading it in blocks of rows. 'hmatrix' solves it
+             iteratively as well, storing a hierarchical (H-matrix)
+             compression of the AIC whose compression ratio and error
+             are reported by the matrix itself, and 'treecode' solves it
+             iteratively approximating the AIC products by a Barnes-Hut
+             tree-code (opening angle theta). Iterations and residual
+             of each iterative solve are reported in the attribute
+             "solver_info", and a RuntimeWarning is issued if one of
+             them does not reach the tolerance
+    tol : float
+          Relative tolerance of the iterative solvers
+    n_workers : integer
+                Number of threads evaluating the horseshoe vortex kernel,
+                each one over a block of control points (rows of the AIC)
+    tile_size : integer
+                Size of the square tiles of the out-of-core assembly
+    memory_budget : integer
+                    Memory available for blocks of the out-of-core AIC
+                    during the solve (bytes)
+    aic_path : string, optional
+               File of the out-of-core AIC (a temporary file by default)
+    aca_tol : float
+              Relative tolerance of the low rank blocks of the H-matrix
+    theta : float
+            Opening angle (accuracy parameter) of the tree-code
     """
 
-    def __init__(self):
-        self.Points = []
-        self.Panels = []
+    def __init__(self, cache=None, symmetric=False, solver='dense',
+                 tol=1e-8, n_workers=1, tile_size=512, memory_budget=2**28,
+                 aic_path=None, aca_tol=1e-6, theta=0.5):
+        self.Points = np.empty((0, 2))  # vertices of the mesh
+        self.Topology = MeshTopology()
+        self.Panels = PanelTable(topology=self.Topology)
 
         self.AIC = 0
+        self.AIC_inv = 0
+        self.update_rank = 0  # rank of the updates of AIC_inv
+        self.camber_slope = 0
         self.alpha = []
         self.CL = []
         self.CD = []
 
         self.rho = 1.225
 
+        self.cache = cache
+        self.symmetric = symmetric
+        self.symmetry = None  # (semi-span, image) panel indices
+
+        if solver not in ('dense', 'gmres', 'out-of-core', 'hmatrix',
+                          'treecode'):
+            msg = "Solver should be 'dense', 'gmres', 'out-of-core', " \
+                  "'hmatrix' or 'treecode'"
+            raise ValueError(msg)
+
+        self.solver = solver
+        self.tol = tol
+        self.n_workers = n_workers
+        self.tile_size = tile_size
+        self.memory_budget = memory_budget
+        self.aic_path = aic_path
+        self.aca_tol = aca_tol
+        self.theta = theta
+        self.solver_info = []
+
     def reset(self):
-        self.Points = []
-        self.Panels = []
+        self.Points = np.empty((0, 2))  # vertices of the mesh
+        self.Topology = MeshTopology()
+        self.Panels = PanelTable(topology=self.Topology)
         self.AIC = 0
+        self.AIC_inv = 0
+        self.update_rank = 0  # rank of the updates of AIC_inv
+        self.camber_slope = 0
         self.alpha = []
         self.CL = []
         self.CD = []
 
-    def add_wing(self, lead_edge_coord, chord_lengths, n, m):
+    def add_wing(self, lead_edge_coord, chord_lengths, n, m,
+                 chordwise_spacing='uniform', spanwise_spacing='uniform'):
         """
         Allows the addition of a wing to the mesh, defined by its chords'
         lengths and leading edges locations. The spanwise and chordwise
@@ -48,12 +130,39 @@ class PyVLM(object):
         chord_lengths : list
                         Chord lenghts corresponding to the sections
                         defined by the leading edge coordinates
-        n, m : integer
-               n - nº of chordwise panels
-               m - nº of spanwise panels
+        n : integer
+            nº of chordwise panels
+        m : integer or list
+            nº of spanwise panels of every segment, or of each one
+        chordwise_spacing, spanwise_spacing : string, tuple or array_like
+                                              Distribution of the points
+                                              from the leading edge and
+                                              from the root to the tip
+                                              (see mesh_generator.spacing),
+                                              e.g. ('geometric', 1.5).
+                                              The spanwise law applies to
+                                              the panels of all the
+                                              segments at once (so arrays
+                                              hold sum(m)+1 positions),
+                                              each segment
+                                              taking its part of it scaled
+                                              to its span: 'half-cosine'
+                                              clusters the points towards
+                                              the tip only
         """
 
+        # When possible, the AIC (and its factorization) of the existing
+        # panels is kept and only grown with the interactions involving
+        # the new ones, otherwise it is cleared
+        N0 = len(self.Panels)
+        AIC, AIC_inv = self.AIC, self.AIC_inv
+        incremental = (type(AIC) != int and self.solver == 'dense' and
+                       not self.symmetric)
+
         self.AIC = 0  # clears AIC when modifying the mesh
+        self.AIC_inv = 0
+        self.update_rank = 0
+        self.camber_slope = 0
 
         if len(lead_edge_coord) != len(chord_lengths):
             msg = 'Same number of chords and leading edges required'
@@ -66,6 +175,22 @@ class PyVLM(object):
 
         Nle = len(lead_edge_coord)
 
+        m = [m] * (Nle - 1) if np.ndim(m) == 0 else list(m)
+        if len(m) != Nle - 1:
+            msg = 'A number of spanwise panels per segment required'
+            raise ValueError(msg)
+
+        # Spanwise distribution of the points of the semi-span, from the
+        # root to the tip: each segment takes its part of it (m[k]
+        # panels), from its inner to its outer section, which is reversed
+        # in the specular image (whose segments go from the tip to the
+        # root)
+        S = spacing(spanwise_spacing, sum(m))
+        edges = np.concatenate(([0], np.cumsum(m)))
+        s = [(S[i:j + 1] - S[i]) / (S[j] - S[i])
+             for i, j in zip(edges[:-1], edges[1:])]
+        t = spacing(chordwise_spacing, n)
+
         for k in range(Nle - 1):
             leading_edges = [lead_edge_coord[k],
                              lead_edge_coord[k + 1]]
@@ -75,16 +200,17 @@ class PyVLM(object):
             # The mesh is created taking into account the desired
             # mesh density spanwise -"n"- and chordwise -"m"-
 
-            mesh = Mesh(leading_edges, chords, n, m)
+            mesh = Mesh(leading_edges, chords, n, m[k], t, s[k])
 
             # The points of the mesh and its panels - sets of 4 points
             # orderly arranged - are calculated
 
-            Points_ = mesh.points()
-            Panels_ = mesh.panels()
+            grid, panels, chordwise_position = mesh.arrays()
 
-            self.Points.extend(Points_)
-            self.Panels.extend(Panels_)
+            # Vertices shared with the existing panels are merged, and
+            # spanwise strips are numbered after the existing ones
+            self.Panels.add(grid.reshape(-1, 2), panels, m[k],
+                            chordwise_position)
 
         # Specular image to generate the opposite semi-span of the wing
         lead_edge_coord_ = lead_edge_coord[::-1]
@@ -96,13 +222,110 @@ class PyVLM(object):
             chords = [chord_lengths_[k],
                       chord_lengths_[k + 1]]
 
-            mesh = Mesh(leading_edges, chords, n, m)
+            j = Nle - 2 - k  # segment of the right semi-span
+            mesh = Mesh(leading_edges, chords, n, m[j], t, 1 - s[j][::-1])
+
+            grid, panels, chordwise_position = mesh.arrays()
+
+            self.Panels.add(grid.reshape(-1, 2), panels, m[j],
+                            chordwise_position)
 
-            Points_ = mesh.points()
-            Panels_ = mesh.panels()
+        self.Points = self.Topology.vertices
 
-            self.Points.extend(Points_)
-            self.Panels.extend(Panels_)
+        if incremental:
+            self._grow_aic(N0, AIC, AIC_inv)
+
+    def move_panels(self, indices, P1, P2, P3, P4, max_rank=None):
+        """
+        Moves the corner points of a subset of panels (e.g. those of a
+        wing section in a design loop), recomputing only the affected
+        rows and columns of the AIC matrix.
+
+        The change of the AIC has rank 2k at most (k moved panels), so
+        its factorization is updated through the Sherman-Morrison-
+        Woodbury formula in O(kN²). Once the accumulated rank of the
+        updates exceeds max_rank, the AIC is factorized again instead.
+
+        Vertices shared with panels which are not moved stay in place:
+        the moved panels are detached from them in the mesh topology.
+
+        Parameters
+        ----------
+        indices : array_like
+                  Panels to be moved
+        P1, P2, P3, P4 : array_like, shape (k, 2)
+                         New corner points of the panels
+        max_rank : integer
+                   Maximum accumulated rank of the updates (N/4 by
+                   default)
+        """
+
+        Panel = self.Panels
+        K = np.asarray(indices)
+        k = len(K)
+        N = len(Panel)
+        V = 1.0
+
+        incremental = (type(self.AIC) != int and self.solver == 'dense' and
+                       not self.symmetric)
+
+        if incremental:
+            # trailing vortices of the panels before being moved
+            _, Wi_old = InfluenceOperator(Panel.CP, Panel.A[K], Panel.B[K],
+                                          n_workers=self.n_workers).assemble()
+
+        Panel.update(K, P1, P2, P3, P4)
+        self.Points = self.Topology.vertices
+        self.camber_slope = 0
+
+        if not incremental:
+            self.AIC = 0
+            self.AIC_inv = 0
+            return
+
+        # influence of all the horseshoes on the moved control points and
+        # of the moved horseshoes on all the control points
+        rows, Wi_rows = InfluenceOperator(Panel.CP[K], Panel.A, Panel.B,
+                                          n_workers=self.n_workers).assemble()
+        cols, Wi_cols = InfluenceOperator(Panel.CP, Panel.A[K], Panel.B[K],
+                                          n_workers=self.n_workers).assemble()
+
+        # The AIC change is the product U·V of U = [E, C] and V = [R; Eᵀ],
+        # where E are the columns K of the identity, R the change of the
+        # moved rows and C that of the moved columns (out of those rows)
+        R = rows - self.AIC[K]
+        C = cols - self.AIC[:, K]
+        C[K] = 0
+
+        self.AIC = np.array(self.AIC)
+        self.AIC[:, K] = cols
+        self.AIC[K] = rows
+
+        # induced vel. by trailing vortices and induced AoA(rad)
+        Wi = Panel.accul_trail_ind_vel + Wi_cols - Wi_old
+        Wi[K] = Wi_rows
+        Panel.accul_trail_ind_vel = Wi
+        Panel.alpha_ind = np.arctan(abs(Panel.accul_trail_ind_vel)/V)
+
+        if (type(self.AIC_inv) == int):
+            return
+
+        if max_rank is None:
+            max_rank = N // 4
+
+        self.update_rank += 2*k
+
+        if self.update_rank > max_rank:
+            self.AIC_inv = 0  # factorized again on the next solve
+        else:
+            AIC_inv = self.AIC_inv
+            AIC_inv_U = np.hstack((AIC_inv[:, K], AIC_inv @ C))
+            V_AIC_inv = np.vstack((R @ AIC_inv, AIC_inv[K]))
+            capacitance = np.eye(2*k) + np.hstack((V_AIC_inv[:, K],
+                                                   V_AIC_inv @ C))
+
+            self.AIC_inv = AIC_inv - AIC_inv_U @ np.linalg.solve(capacitance,
+                                                                 V_AIC_inv)
 
     def check_mesh(self, print_mesh=False, plot_mesh=False):
         """
@@ -120,15 +343,9 @@ class PyVLM(object):
         Panels = self.Panels
 
         # Check for coincident points
-        N = len(Points)
-        for i in range(N):
-            count = 0
-            for j in range(N):
-                if(((Points[j] == Points[i]).all()) is True):
-                    count += 1
-                    if(count > 1):
-                        msg = "Two points of the mesh coincide"
-                        raise ValueError(msg)
+        if len(np.unique(Points, axis=0)) < len(Points):
+            msg = "Two points of the mesh coincide"
+            raise ValueError(msg)
 
         # Check for incorrectly defined panels
         N = len(Panels)
@@ -207,76 +424,37 @@ class PyVLM(object):
         #       element Aij is the velocity induced by the horshoe vortex
         #       in panel j on panel i
         #     - also the induced velocity by *only* the trailing vortices
-        #        "Wi" on panel i is calculated and stored in the Panel object
-        #       attribute "accul_trail_induced_vel"
-
-        N = len(Panel)
-
-        if (type(self.AIC) == int):
-            # In case it is the first time the method is called, it proceeds
-            # to compute the AIC matrix
-
-            AIC = np.zeros((N, N))  # Aerodynamic Influence Coefficient matrix
+        #        "Wi" on panel i is calculated and stored in the panel table
+        #       array "accul_trail_ind_vel"
 
-            for i in range(N):
-                panel_pivot = Panel[i]
-                CP = panel_pivot.CP
-
-                Wi_ = 0
-                for j in range(N):
-                    panel = Panel[j]
-                    Wn, Wi = panel.induced_velocity(CP)
-                    AIC[i, j] = Wn  # induced normal velocity by horshoe vortices
-                    Wi_ += Wi  # induced normal velocity by trailing vortices
-
-                Panel[i].accul_trail_ind_vel = Wi_
-                Panel[i].alpha_ind = np.arctan(abs(Wi_)/V)  # induced AoA(rad)
-
-            self.AIC = AIC
+        self._assemble_aic()
 
         #   (b) UPSTREAM NORMAL VELOCITY
         #     It will depend on the angle of attack -"alpha"- and the camber
         #     gradient at each panel' position within the local chord
 
-        Vinf_n = np.zeros(N)  # upstream (normal) velocity
+        N = len(Panel)
 
-        airfoil = NACA4()
-        for i in range(N):
-            position = Panel[i].chordwise_position
-            Panel[i].Vinf_n = -V * (alpha - airfoil.camber_gradient(position))
-            Vinf_n[i] = Panel[i].Vinf_n
+        Vinf_n = self._upstream_normal_velocity(alpha)  # upstream normal vel.
+        Panel.Vinf_n = Vinf_n
 
         # 2. CIRCULATION (Γ or gamma)
         # by solving the linear equation (AX = Y) where X = gamma
         # and Y = Vinf_n
 
-        gamma = np.linalg.solve(self.AIC, Vinf_n)
+        gamma = self._solve(Vinf_n)
 
         # 3. AERODYNAMIC FORCES
-        L = 0
-        D = 0
-        S = 0
-
-        for i in range(N):
-            Panel[i].gamma = gamma[i]
-            Panel[i].l = V * rho * Panel[i].gamma * Panel[i].span
-            Panel[i].cl = Panel[i].l / (q_inf * Panel[i].area)
-
-            d0 = (Panel[i].l * Panel[i].accul_trail_ind_vel) / V
-            d1 = -rho * abs(Panel[i].gamma) * Panel[i].span * (Panel[i].accul_trail_ind_vel)
-            d2 = Panel[i].l * np.sin(Panel[i].alpha_ind)
+        # (per panel, stored in the panel table arrays)
+        Panel.gamma = gamma
+        Panel.l, Panel.d = self._aerodynamic_forces(gamma)
+        Panel.cl = Panel.l / (q_inf * Panel.area)
+        Panel.cd = Panel.d / (q_inf * Panel.area)
 
-            # print("%8.3f % 8.3f %8.3f" % (d0, d1, d2))
+        S = Panel.area.sum()
 
-            Panel[i].d = d1
-            Panel[i].cd = Panel[i].d / (q_inf * Panel[i].area)
-
-            L += Panel[i].l
-            D += Panel[i].d
-            S += Panel[i].area
-
-        CL = L / (q_inf * S)
-        CD = D / (q_inf * S)
+        CL = Panel.l.sum() / (q_inf * S)
+        CD = Panel.d.sum() / (q_inf * S)
 
         # PRINTING
         if (print_output is True):
@@ -293,15 +471,344 @@ class PyVLM(object):
         else:
             return CL, CD
 
-    def aerodyn_forces_coeff(self):
+    def vlm_sweep(self, alphas, panel_gamma=False, panel_forces=False):
+        """
+        Applies the VLM theory to a set of angles of attack at once: the
+        upstream normal velocities of all of them are gathered as the
+        columns of a single right-hand side matrix, so the linear system
+        is solved only once for the whole sweep.
+
+        Per-panel results stored in the panel table are not modified.
+
+        Parameters
+        ----------
+        alphas : array_like
+            Angles of attack of the wing(degrees)
+        panel_gamma : boolean
+            Also returns the circulation of each panel
+        panel_forces : boolean
+            Also returns the lift and drag coefficients of each panel
+
+        Returns
+        -------
+        CL, CD : ndarray, shape (n_alpha,)
+            Lift and drag coefficients for each angle of attack
+        gamma : ndarray, shape (N, n_alpha)
+            Circulation of each panel (only if panel_gamma is True)
+        cl, cd : ndarray, shape (N, n_alpha)
+            Lift and drag coefficients of each panel (only if
+            panel_forces is True)
+        """
+
+        Panel = self.Panels
+        rho = self.rho
+        alphas = np.deg2rad(np.atleast_1d(np.asarray(alphas, dtype=float)))
+        V = 1.0
+
+        q_inf = (1 / 2) * rho * (V**2)
+
+        self._assemble_aic()
+
+        Vinf_n = self._upstream_normal_velocity(alphas)
+
+        gamma = self._solve(Vinf_n)
+
+        l, d = self._aerodynamic_forces(gamma)
+        S = Panel.area.sum()
+
+        CL = l.sum(axis=0) / (q_inf * S)
+        CD = d.sum(axis=0) / (q_inf * S)
+
+        output = [CL, CD]
+
+        if panel_gamma:
+            output.append(gamma)
+
+        if panel_forces:
+            area = Panel.area[:, np.newaxis]
+            output.extend([l / (q_inf * area), d / (q_inf * area)])
+
+        return tuple(output)
+
+    def aerodyn_forces_coeff(self, alphas=range(-15, 15, 2)):
         """
         For a given geometry applies the VLM theory for angles of attack
         (alpha) between -15 and 15 degrees, returning CL and CD as lists.
+
+        Parameters
+        ----------
+        alphas : array_like
+            Angles of attack of the wing(degrees)
         """
-        for i in range(-15, 15, 2):
-            cl_, cd_ = self.vlm(i, False)
-            self.alpha.append(i)
-            self.CL.append(cl_)
-            self.CD.append(cd_)
+
+        CL, CD = self.vlm_sweep(alphas)
+
+        self.alpha = list(alphas)
+        self.CL = list(CL)
+        self.CD = list(CD)
 
         return self.alpha, self.CL, self.CD
+
+    def solved(self):
+        """
+        Immutable snapshot of the geometry, AIC matrix and factorization,
+        whose solves return independent results and can run concurrently
+        from several threads (see SolvedWing).
+        """
+
+        return SolvedWing(self)
+
+    def _aerodynamic_forces(self, gamma):
+        """
+        Lift and drag forces on each panel for the given circulation, of
+        shape (N,) or (N, n_alpha) like gamma.
+        """
+
+        Panel = self.Panels
+        rho = self.rho
+        V = 1.0
+
+        span = Panel.span
+        Wi = Panel.accul_trail_ind_vel
+
+        if np.ndim(gamma) > 1:
+            span = span[:, np.newaxis]
+            Wi = Wi[:, np.newaxis]
+
+        l = V * rho * gamma * span
+        d = -rho * abs(gamma) * span * Wi
+
+        return l, d
+
+    def _assemble_aic(self):
+        """
+        Computes the AIC matrix and the induced velocity by the trailing
+        vortices on each panel, unless they are already available.
+        """
+
+        Panel = self.Panels
+        V = 1.0
+
+        if (type(self.AIC) == int):
+            # In case it is the first time the method is called, it proceeds
+            # to compute the AIC matrix (or to load it from the cache)
+
+            self.symmetry = None
+            if self.symmetric:
+                mirror = Panel.mirror_index()
+                if mirror is not None:
+                    semispan = np.flatnonzero(np.arange(len(Panel)) < mirror)
+                    self.symmetry = semispan, mirror[semispan]
+
+            tag = '' if self.symmetry is None else '_sym'
+
+            cached = None
+            if self.cache is not None and self.solver == 'dense':
+                cached = self.cache.load(Panel, tag)
+
+            if cached is not None:
+                self.AIC, self.AIC_inv, Wi = cached
+
+            else:
+                # Aerodynamic Influence Coefficient matrix, evaluated for
+                # all the control points and horseshoe vortices at once.
+                # With the symmetric solve only the control points of one
+                # semi-span are needed: the influence of each horseshoe
+                # there is added to that of its image, whose circulation
+                # is the same
+                if self.symmetry is None:
+                    operator = InfluenceOperator(Panel.CP, Panel.A, Panel.B,
+                                                 n_workers=self.n_workers)
+                else:
+                    semispan, image = self.symmetry
+                    operator = InfluenceOperator(Panel.CP[semispan], Panel.A,
+                                                 Panel.B, semispan, image,
+                                                 n_workers=self.n_workers)
+
+                if self.solver == 'gmres':
+                    # Matrix-free AIC, only evaluated through its products
+                    self.AIC = operator
+                    Wi = operator.trailing_velocity()
+                elif self.solver == 'treecode':
+                    self.AIC = TreecodeOperator(operator.P, Panel.A, Panel.B,
+                                                operator.columns,
+                                                operator.images, self.theta)
+                    Wi = self.AIC.trailing_velocity()
+                elif self.solver == 'hmatrix':
+                    self.AIC = HMatrix(operator, tol=self.aca_tol)
+                    Wi = operator.trailing_velocity()
+                elif self.solver == 'out-of-core':
+                    if self.aic_path is None:
+                        # The mapping keeps a handle of its own to the
+                        # (unnamed) file, which is deleted once the
+                        # matrix is released
+                        with tempfile.TemporaryFile() as aic_file:
+                            AIC = np.memmap(aic_file, dtype=float,
+                                            mode='w+', shape=operator.shape)
+                    else:
+                        AIC = np.memmap(self.aic_path, dtype=float,
+                                        mode='w+', shape=operator.shape)
+
+                    Wi = operator.assemble_tiled(AIC, self.tile_size)
+                    AIC.flush()
+
+                    self.AIC = OutOfCoreMatrix(AIC, self.memory_budget)
+                else:
+                    self.AIC, Wi = operator.assemble()
+
+            Wi = self._expand(Wi)
+
+            # induced vel. by trailing vortices and induced AoA(rad)
+            Panel.accul_trail_ind_vel = Wi
+            Panel.alpha_ind = np.arctan(abs(Panel.accul_trail_ind_vel)/V)
+
+    def _grow_aic(self, N0, AIC, AIC_inv):
+        """
+        Grows the AIC matrix of the first N0 panels, computing only the
+        influence of the new horseshoe vortices on the old control points
+        and of all of them on the new ones. A factorization of the old
+        AIC is updated through the Schur complement of the new block.
+        """
+
+        Panel = self.Panels
+        N = len(Panel)
+        V = 1.0
+
+        # influence of the new horseshoes on the old control points
+        AIC_on, Wi_on = InfluenceOperator(Panel.CP[:N0], Panel.A[N0:],
+                                          Panel.B[N0:],
+                                          n_workers=self.n_workers).assemble()
+        # influence of all the horseshoes on the new control points
+        AIC_n, Wi_n = InfluenceOperator(Panel.CP[N0:], Panel.A, Panel.B,
+                                        n_workers=self.n_workers).assemble()
+
+        self.AIC = np.empty((N, N))
+        self.AIC[:N0, :N0] = AIC
+        self.AIC[:N0, N0:] = AIC_on
+        self.AIC[N0:] = AIC_n
+
+        # induced vel. by trailing vortices and induced AoA(rad)
+        Panel.accul_trail_ind_vel[:N0] += Wi_on
+        Panel.accul_trail_ind_vel[N0:] = Wi_n
+        Panel.alpha_ind = np.arctan(abs(Panel.accul_trail_ind_vel)/V)
+
+        if (type(AIC_inv) != int):
+            # Block inverse, where S is the Schur complement of the old AIC
+            AIC_inv_B = AIC_inv @ AIC_on
+            C_AIC_inv = AIC_n[:, :N0] @ AIC_inv
+            S_inv = np.linalg.inv(AIC_n[:, N0:] - AIC_n[:, :N0] @ AIC_inv_B)
+
+            self.AIC_inv = np.empty((N, N))
+            self.AIC_inv[:N0, :N0] = AIC_inv + AIC_inv_B @ S_inv @ C_AIC_inv
+            self.AIC_inv[:N0, N0:] = -AIC_inv_B @ S_inv
+            self.AIC_inv[N0:, :N0] = -S_inv @ C_AIC_inv
+            self.AIC_inv[N0:, N0:] = S_inv
+
+    def _solve(self, Vinf_n):
+        """
+        Solves AIC·gamma = Vinf_n for one or several right-hand sides
+        (columns of Vinf_n). With the symmetric solve, only the equations
+        of one semi-span are solved.
+
+        The AIC only depends on the geometry, so it is factorized once
+        (as its inverse, since NumPy does not expose LU triangular
+        solvers) and every later solve is a single O(N²) product. The
+        factorization is cleared along with the AIC, and stored in the
+        on-disk cache (if any) once computed.
+
+        With the iterative solver, the preconditioner takes the place of
+        the factorization and GMRES is run for each right-hand side.
+        """
+
+        self._factorize()
+
+        Vinf_n = self._reduce(Vinf_n)
+
+        if self.solver != 'dense':
+            gamma = np.empty(Vinf_n.shape)
+            self.solver_info = []
+            for k in np.ndindex(Vinf_n.shape[1:]):
+                column = (slice(None),) + k
+                gamma[column], info = gmres(self.AIC, Vinf_n[column],
+                                            self.AIC_inv, self.tol)
+                self.solver_info.append(info)
+        else:
+            gamma = self.AIC_inv @ Vinf_n
+
+        return self._expand(gamma)
+
+    def _factorize(self):
+        """
+        Computes the factorization of the AIC (its inverse) or, with the
+        iterative solvers, the preconditioner, unless already available.
+        """
+
+        if (type(self.AIC_inv) == int) and self.solver != 'dense':
+            # Block-diagonal preconditioner, one block per spanwise strip
+            strip = self._reduce(self.Panels.strip)
+            order = np.argsort(strip, kind='stable')
+            _, start = np.unique(strip[order], return_index=True)
+
+            self.AIC_inv = BlockJacobi(self.AIC, np.split(order, start[1:]))
+
+        elif (type(self.AIC_inv) == int):
+            self.AIC_inv = np.linalg.inv(self.AIC)
+            self.update_rank = 0
+
+            if self.cache is not None:
+                tag = '' if self.symmetry is None else '_sym'
+                Wi = self._reduce(self.Panels.accul_trail_ind_vel)
+                self.cache.save(self.Panels, self.AIC, self.AIC_inv, Wi, tag)
+
+    def _reduce(self, x):
+        """
+        Values of x (indexed by panel along its first axis) on the solved
+        semi-span when the symmetric solve is in use.
+        """
+
+        if self.symmetry is None:
+            return x
+
+        return x[self.symmetry[0]]
+
+    def _expand(self, x):
+        """
+        Inverse of _reduce: copies the values of the solved semi-span on
+        its specular image.
+        """
+
+        if self.symmetry is None:
+            return x
+
+        semispan, image = self.symmetry
+
+        x_ = np.empty((len(self.Panels),) + np.shape(x)[1:])
+        x_[semispan] = x
+        x_[image] = x
+
+        return x_
+
+    def _upstream_normal_velocity(self, alpha):
+        """
+        Upstream normal velocity on each panel for the given angle(s) of
+        attack (rad), depending on the camber gradient at each panel'
+        position within the local chord. For an array of angles, each
+        column of the result corresponds to one of them.
+        """
+
+        Panel = self.Panels
+        V = 1.0
+
+        if (type(self.camber_slope) == int):
+            # The chordwise position of the panels is fixed by the mesh, so
+            # the camber gradient is only computed once per geometry
+            airfoil = NACA4()
+            self.camber_slope = np.array([airfoil.camber_gradient(position)
+                                          for position
+                                          in Panel.chordwise_position])
+
+        camber_gradient = self.camber_slope
+        if np.ndim(alpha) > 0:
+            camber_gradient = camber_gradient[:, np.newaxis]
+
+        return -V * (alpha - camber_gradient)
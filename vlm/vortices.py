@@ -87,8 +87,10 @@ def v_induced_by_horseshoe_vortex(P, A, B):
     g = B[0] - A[0]
     h = B[1] - A[1]
 
+    # Points (numerically) aligned with the bounded vortex, whose induced
+    # velocity would be round-off noise, are excluded
     div = a*d - c*b
-    if (div == 0):
+    if (abs(div) <= 1e-10*e*f):
         v_bounded = 0
     else:
         v_bounded = (1/div) * (((g*a + h*b)/e) - ((g*c + h*d)/f))
@@ -112,6 +114,66 @@ def v_induced_by_horseshoe_vortex(P, A, B):
     return v_total, v_trail
 
 
+def v_induced_by_horseshoe_vortices(P, A, B):
+    """
+    Batched version of v_induced_by_horseshoe_vortex: induced velocity
+    at every point P[i] due to every horseshoe vortex of strenght
+    gamma=1 positioned by A[j] and B[j]. The singular cases (point
+    aligned with the bounded or with a trailing vortex) are masked and
+    contribute zero, as in the scalar function.
+
+    Leading dimensions of the arguments are broadcast, so stacks of
+    independent geometries can be evaluated at once.
+
+    Parameters
+    ----------
+    P : array_like, shape (..., M, 2)
+        Points of reference
+    A, B : array_like, shape (..., N, 2)
+           Points of the horseshoe vortices
+
+    Returns
+    -------
+    v_total, v_trail : ndarray, shape (..., M, N)
+        Total induced velocity and induced velocity by *only* the
+        trailing vortices, where element [i, j] is the velocity induced
+        by horseshoe j on point i
+    """
+
+    pi = np.pi
+
+    P = np.asarray(P, dtype=float)
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+
+    a = P[..., :, np.newaxis, 0] - A[..., np.newaxis, :, 0]
+    b = P[..., :, np.newaxis, 1] - A[..., np.newaxis, :, 1]
+    c = P[..., :, np.newaxis, 0] - B[..., np.newaxis, :, 0]
+    d = P[..., :, np.newaxis, 1] - B[..., np.newaxis, :, 1]
+    e = (a**2 + b**2)**0.5
+    f = (c**2 + d**2)**0.5
+    g = B[..., np.newaxis, :, 0] - A[..., np.newaxis, :, 0]
+    h = B[..., np.newaxis, :, 1] - A[..., np.newaxis, :, 1]
+
+    div = a*d - c*b
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_bounded = (1/div) * (((g*a + h*b)/e) - ((g*c + h*d)/f))
+        v_trail1 = -(a + e)/(b*e)
+        v_trail2 = (c + f)/(d*f)
+
+    # Points (numerically) aligned with a bounded vortex are masked with
+    # the same tolerance as in the scalar function
+    v_bounded = np.where(abs(div) <= 1e-10*e*f, 0, v_bounded) / (4*pi)
+    v_trail1 = np.where(b == 0, 0, v_trail1)
+    v_trail2 = np.where(d == 0, 0, v_trail2)
+
+    v_trail = (v_trail1 + v_trail2) / (4*pi)
+    v_total = v_trail + v_bounded
+
+    return v_total, v_trail
+
+
 def v_induced_by_finite_vortex_line(P, A, B, gamma=1):
     """
 
@@ -147,3 +209,59 @@ def v_induced_by_finite_vortex_line(P, A, B, gamma=1):
     v = sign * (gamma/(4 * pi * h)) * (cos_1 - cos_2)
 
     return v
+
+
+def v_induced_by_finite_vortex_lines(P, A, B, gamma=1, total=False):
+    """
+    Batched version of v_induced_by_finite_vortex_line: induced velocity
+    at every point P[i] due to every finite straight line vortex defined
+    by A[k] and B[k], with circulation gamma[k] from A[k] --> B[k].
+    Points aligned with a vortex line get zero induced velocity.
+
+    Parameters
+    ----------
+    P : array_like, shape (M, 2)
+        Points of reference
+    A, B : array_like, shape (K, 2)
+           Points of the vortices
+    gamma : float or array_like, shape (K,)
+            Circulation of each vortex
+    total : boolean
+            If True, the contributions of all the vortices are summed
+
+    Returns
+    -------
+    v : ndarray, shape (M, K) or (M,) if total is True
+    """
+
+    pi = np.pi
+
+    P = np.asarray(P, dtype=float)
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    gamma = np.asarray(gamma, dtype=float)
+
+    AB = B - A
+    i = AB / np.linalg.norm(AB, axis=1)[:, np.newaxis]  # vortex direction
+
+    PA = A[np.newaxis, :, :] - P[:, np.newaxis, :]
+    PB = B[np.newaxis, :, :] - P[:, np.newaxis, :]
+
+    # Normal projection of PA, which equals the signed distance to the
+    # vortex line: its sign follows cross(i_PA, i)
+    cross = PA[..., 0]*i[:, 1] - PA[..., 1]*i[:, 0]
+    h = abs(cross)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_1 = -(PA[..., 0]*i[:, 0] + PA[..., 1]*i[:, 1]) / \
+            np.linalg.norm(PA, axis=2)
+        cos_2 = -(PB[..., 0]*i[:, 0] + PB[..., 1]*i[:, 1]) / \
+            np.linalg.norm(PB, axis=2)
+        v = np.sign(cross) * (gamma/(4 * pi * h)) * (cos_1 - cos_2)
+
+    v = np.where(h == 0, 0, v)
+
+    if total:
+        v = v.sum(axis=1)
+
+    return v